@@ -3,11 +3,15 @@ __all__ = ['sigmoid', 'tanh', 'ReLU', 'LeakyReLU', 'ELU', 'swish', 'softmax']
 import warnings
 
 import kaitorch.functional as F
-from kaitorch.core import Scalar
+from kaitorch.core import ACT, Tensor
 
 
 class Activation:
-    pass
+
+    def __call__(self, x):
+        # f works elementwise on floats and arrays alike; backward
+        # looks up self.df through the ACT op
+        return type(x)(self.f(x.data), (x, ), ACT, self)
 
 
 class sigmoid(Activation):
@@ -18,20 +22,11 @@ class sigmoid(Activation):
     def __repr__(self):
         return 'sigmoid'
 
-    def __call__(self, scalar):
-
-        def _forward():
-            y = F.sigmoid(scalar.data)
-            return Scalar(y, (scalar, ), 'sigmoid')
-
-        out = _forward()
-
-        def _backward():
-            scalar.grad += F.d_sigmoid(out.data) * out.grad
+    def f(self, x):
+        return F.sigmoid(x)
 
-        out._backward = _backward
-
-        return out
+    def df(self, y):
+        return F.d_sigmoid(y)
 
 
 class tanh(Activation):
@@ -42,20 +37,11 @@ class tanh(Activation):
     def __repr__(self):
         return 'tanh'
 
-    def __call__(self, scalar):
-
-        def _forward():
-            y = F.tanh(scalar.data)
-            return Scalar(y, (scalar, ), 'tanh')
-
-        out = _forward()
+    def f(self, x):
+        return F.tanh(x)
 
-        def _backward():
-            scalar.grad += F.d_tanh(out.data) * out.grad
-
-        out._backward = _backward
-
-        return out
+    def df(self, y):
+        return F.d_tanh(y)
 
 
 class swish(Activation):
@@ -70,20 +56,11 @@ class swish(Activation):
     def __repr__(self):
         return f'swish(β={self.beta})'
 
-    def __call__(self, scalar):
-
-        def _forward():
-            y = F.swish(scalar.data, self.beta)
-            return Scalar(y, (scalar, ), 'swish')
-
-        out = _forward()
-
-        def _backward():
-            scalar.grad += F.d_swish(out.data, self.beta) * out.grad
-
-        out._backward = _backward
+    def f(self, x):
+        return F.swish(x, self.beta)
 
-        return out
+    def df(self, y):
+        return F.d_swish(y, self.beta)
 
 
 class ReLU(Activation):
@@ -94,20 +71,11 @@ class ReLU(Activation):
     def __repr__(self):
         return 'ReLU'
 
-    def __call__(self, scalar):
+    def f(self, x):
+        return F.ReLU(x)
 
-        def _forward():
-            y = F.ReLU(scalar.data)
-            return Scalar(y, (scalar, ), 'ReLU')
-
-        out = _forward()
-
-        def _backward():
-            scalar.grad += F.d_ReLU(out.data) * out.grad
-
-        out._backward = _backward
-
-        return out
+    def df(self, y):
+        return F.d_ReLU(y)
 
 
 class LeakyReLU(Activation):
@@ -122,20 +90,11 @@ class LeakyReLU(Activation):
     def __repr__(self):
         return f'LeakyReLU(α={self.alpha})'
 
-    def __call__(self, scalar):
-
-        def _forward():
-            y = F.LeakyReLU(scalar.data, self.alpha)
-            return Scalar(y, (scalar, ), 'LeakyReLU')
-
-        out = _forward()
-
-        def _backward():
-            scalar.grad += F.d_LeakyReLU(out.data, self.alpha) * out.grad
+    def f(self, x):
+        return F.LeakyReLU(x, self.alpha)
 
-        out._backward = _backward
-
-        return out
+    def df(self, y):
+        return F.d_LeakyReLU(y, self.alpha)
 
 
 class ELU(Activation):
@@ -150,25 +109,22 @@ class ELU(Activation):
     def __repr__(self):
         return f'ELU(α={self.alpha})'
 
-    def __call__(self, scalar):
-
-        def _forward():
-            y = F.ELU(scalar.data, self.alpha)
-            return Scalar(y, (scalar, ), 'ELU')
-
-        out = _forward()
+    def f(self, x):
+        return F.ELU(x, self.alpha)
 
-        def _backward():
-            scalar.grad += F.d_ELU(out.data, self.alpha) * out.grad
-
-        out._backward = _backward
-
-        return out
+    def df(self, y):
+        return F.d_ELU(y, self.alpha)
 
 
 def softmax(ins: list):
 
+    # Tensor: one distribution per row
+    if isinstance(ins, Tensor):
+        exps = ins.exp()
+        sums = exps.sum(axis=-1, keepdims=True)
+        return exps / sums
+
     exps = [n.exp() for n in ins]
-    sums = sum([n.data for n in exps])
+    sums = sum(exps)
     outs = [n/sums for n in exps]
     return outs
@@ -0,0 +1,56 @@
+'''
+Run the benchmark suite, save its results as JSON, and compare them with
+a saved baseline.
+
+    python -m kaitorch.bench                          # every case
+    python -m kaitorch.bench -k 'scalar|optimizer'    # cases matching a regex
+    python -m kaitorch.bench -o baseline.json         # save the results
+    python -m kaitorch.bench -c baseline.json         # run, then compare
+    python -m kaitorch.bench compare old.json new.json
+
+Comparing exits with status 1 when any case regressed by more than the
+threshold. The other modules in kaitorch.bench are standalone reports on
+one subsystem each, run as python -m kaitorch.bench.<name>.
+'''
+import argparse
+import sys
+
+from kaitorch.bench import suite
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv[:1] == ['compare']:
+        parser = argparse.ArgumentParser(prog='python -m kaitorch.bench compare')
+        parser.add_argument('baseline')
+        parser.add_argument('current')
+        parser.add_argument('-t', '--threshold', type=float, default=0.10)
+        args = parser.parse_args(argv[1:])
+        regressions = suite.compare(suite.load(args.baseline), suite.load(args.current), args.threshold)
+        return 1 if regressions else 0
+
+    parser = argparse.ArgumentParser(prog='python -m kaitorch.bench')
+    parser.add_argument('-k', '--pattern', help='only run cases whose name matches this regex')
+    parser.add_argument('-o', '--output', help='write the results to this JSON file')
+    parser.add_argument('-c', '--compare', help='compare the results with this baseline JSON file')
+    parser.add_argument('-t', '--threshold', type=float, default=0.10, help='slowdown that counts as a regression')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05, help='seconds each repeat runs for at least')
+    args = parser.parse_args(argv)
+
+    report = suite.run(args.pattern, args.repeat, args.min_time)
+    if args.output:
+        suite.dump(report, args.output)
+
+    if args.compare:
+        print()
+        regressions = suite.compare(suite.load(args.compare), report, args.threshold)
+        if regressions:
+            print(f'\n{len(regressions)} regression(s): {", ".join(regressions)}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
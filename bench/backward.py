@@ -0,0 +1,48 @@
+'''
+How Scalar.backward scales with graph depth and node count.
+
+    python -m kaitorch.bench.backward
+'''
+import sys
+
+from kaitorch.bench.suite import measure
+from kaitorch.core import Scalar, build_topo
+
+
+def chain(depth):
+    # depth sequential ops on one input: the worst case for recursion
+    x = Scalar(1.0)
+    y = x
+    for _ in range(depth):
+        y = y * 1.0001 + 0.0001
+    return y
+
+
+def fan_in(width):
+    # one output summing width products: many nodes, shallow depth
+    xs = [Scalar(float(i)) for i in range(width)]
+    return sum((xi * xi for xi in xs), Scalar(0.0))
+
+
+def run(sizes=(1_000, 10_000, 100_000, 300_000)):
+
+    print(f'recursion limit: {sys.getrecursionlimit()}')
+    print(f"{'graph':<8}{'size':>10}{'nodes':>10}{'topo (s)':>12}{'backward (s)':>15}{'cached (s)':>13}{'ns/node':>10}")
+
+    for name, make in (('chain', chain), ('fan_in', fan_in)):
+        for size in sizes:
+            root = make(size)
+            topo = build_topo(root)
+
+            t_topo = measure(lambda: build_topo(root), repeat=3)
+            t_full = measure(lambda: root.backward(retain_graph=True), repeat=3)
+            t_cached = measure(lambda: root.backward(topo=topo, retain_graph=True), repeat=3)
+
+            print(
+                f'{name:<8}{size:>10}{len(topo):>10}{t_topo:>12.4f}'
+                f'{t_full:>15.4f}{t_cached:>13.4f}{t_full / len(topo) * 1e9:>10.0f}'
+            )
+
+
+if __name__ == '__main__':
+    run()
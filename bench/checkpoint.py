@@ -0,0 +1,72 @@
+'''
+Checkpoint save and load time for a model of ~10M parameters with Adam
+state, memory-mapped and read into memory, against pickling the model.
+
+    python -m kaitorch.bench.checkpoint
+'''
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+
+from kaitorch import checkpoint
+from kaitorch.bench.suite import measure
+from kaitorch.models import Sequential
+
+
+def synthetic(path, sizes):
+    # written straight to a checkpoint, with optimizer state included
+    rng = np.random.default_rng(0)
+    layers, arrays = [], {}
+    for i, (nins, nouts) in enumerate(zip(sizes, sizes[1:])):
+        layers.append({'type': 'Dense', 'nouts': nouts, 'activation': 'ReLU', 'initializer': 'glorot_uniform'})
+        for j, shape in enumerate(((nins, nouts), (nouts, ))):
+            arrays[f'{i}.{j}'] = rng.normal(size=shape)
+            arrays[f'm.{i}.{j}'] = rng.normal(size=shape)
+            arrays[f'v.{i}.{j}'] = rng.random(size=shape)
+    header = {
+        'input_size': sizes[0],
+        'layers': layers,
+        'optimizer': {'type': 'Adam', 'config': {'lr': 0.001, 'beta1': 0.9, 'beta2': 0.999, 'epsilon': 1e-8, 'decay_rate': 1.0}},
+        'loss': 'MeanSquaredError',
+    }
+    checkpoint.write(path, header, arrays)
+
+
+def run(sizes=(1024, 2048, 2048, 2048, 1)):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.kt')
+        synthetic(path, sizes)
+        model = Sequential.load(path, mmap_mode=None)
+        params = sum(np.size(p.data) for p in model.parameters())
+        x = np.ones((1, sizes[0]))
+
+        print(f'{params:,} parameters with Adam state, {os.path.getsize(path) / 2**20:,.0f} MB')
+        print(f"{'':<26}{'time (ms)':>12}")
+
+        t = measure(lambda: model.save(path), repeat=3, min_time=0)
+        print(f"{'save':<26}{t * 1e3:>12.1f}")
+
+        t = measure(lambda: Sequential.load(path), repeat=3, min_time=0)
+        print(f"{'load, mmap':<26}{t * 1e3:>12.1f}")
+        # timed once - only the first predict faults the weights in
+        loaded = Sequential.load(path)
+        start = time.perf_counter()
+        loaded.predict(x, as_scalar=True)
+        print(f"{'  first predict':<26}{(time.perf_counter() - start) * 1e3:>12.1f}")
+
+        t = measure(lambda: Sequential.load(path, mmap_mode=None), repeat=3, min_time=0)
+        print(f"{'load, into memory':<26}{t * 1e3:>12.1f}")
+
+        model.tape = None
+        t = measure(lambda: pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL), repeat=3, min_time=0)
+        print(f"{'pickle.dumps':<26}{t * 1e3:>12.1f}")
+        blob = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+        t = measure(lambda: pickle.loads(blob), repeat=3, min_time=0)
+        print(f"{'pickle.loads':<26}{t * 1e3:>12.1f}")
+
+
+if __name__ == '__main__':
+    run()
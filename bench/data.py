@@ -0,0 +1,63 @@
+'''
+Streaming fit with and without background prefetch: a source whose
+batches take as long to produce as they do to train on, read directly
+and through a DataLoader that overlaps the two.
+
+    python -m kaitorch.bench.data
+'''
+import time
+
+import numpy as np
+
+import kaitorch.losses as L
+import kaitorch.optimizers as O
+from kaitorch.bench.suite import quiet
+from kaitorch.data import DataLoader, batches
+from kaitorch.layers import Dense
+from kaitorch.models import Sequential
+
+
+def model(width, seed=0):
+    m = Sequential([Dense(width, 'ReLU'), Dense(width, 'ReLU'), Dense(1, 'sigmoid')], seed=seed)
+    m.compile(O.SGD(), L.binary_crossentropy())
+    return m
+
+
+def slow(source, delay):
+    # stands in for a feature pipeline - I/O and parsing that release the GIL
+    for batch in source:
+        time.sleep(delay)
+        yield batch
+
+
+def epoch_time(source, width):
+    m = model(width)
+    # timed once, as a generator source is used up by one epoch
+    start = time.perf_counter()
+    with quiet():
+        m.fit(source, epochs=1)
+    return time.perf_counter() - start
+
+
+def run(n=16_384, features=32, width=256, batch_size=512, prefetch=(1, 2, 8)):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(n, features))
+    y = (x[:, 0] > 0).astype(np.float64)
+    n_batches = -(-n // batch_size)
+
+    # time one training pass, then make the source equally slow
+    train = epoch_time(batches(x, y, batch_size), width)
+    delay = train / n_batches
+
+    print(f'{n_batches} batches, {delay * 1e3:.2f} ms to produce and ~{delay * 1e3:.2f} ms to train each')
+    print(f"{'source':<22}{'epoch (s)':>12}{'batches/s':>12}")
+    t = epoch_time(slow(batches(x, y, batch_size), delay), width)
+    print(f"{'generator':<22}{t:>12.3f}{n_batches / t:>12.1f}")
+    for depth in prefetch:
+        loader = DataLoader(slow(batches(x, y, batch_size), delay), prefetch=depth)
+        t = epoch_time(loader, width)
+        print(f"{f'DataLoader(prefetch={depth})':<22}{t:>12.3f}{n_batches / t:>12.1f}")
+
+
+if __name__ == '__main__':
+    run()
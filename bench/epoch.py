@@ -0,0 +1,44 @@
+'''
+Epoch time of Sequential.fit against dataset size. With one loss graph per
+batch the time per record should stay flat as N grows.
+
+    python -m kaitorch.bench.epoch
+'''
+import numpy as np
+
+from kaitorch.bench.suite import measure, quiet
+from kaitorch.layers import Dense
+from kaitorch.losses import MeanSquaredError
+from kaitorch.models import Sequential
+from kaitorch.optimizers import SGD
+
+
+def epoch_time(n, features=16, batch_size=32, repeat=3):
+    rng = np.random.default_rng(0)
+    x = rng.random((n, features))
+    y = x.sum(axis=1)
+
+    model = Sequential()
+    model.add(Dense(32, activation='ReLU'))
+    model.add(Dense(1))
+    model.compile(optimizer=SGD(lr=0.001), loss=MeanSquaredError())
+
+    return measure(lambda: model.fit(x, y, epochs=1, batch_size=batch_size), repeat, min_time=0)
+
+
+def run(sizes=(1_000, 2_000, 4_000, 8_000, 16_000, 32_000)):
+
+    with quiet():
+        times = [epoch_time(n) for n in sizes]
+
+    print(f"{'records':>10}{'epoch (s)':>12}{'us/record':>12}")
+    for n, t in zip(sizes, times):
+        print(f'{n:>10}{t:>12.4f}{t / n * 1e6:>12.1f}')
+
+    # slope of log(time) against log(N): 1 is linear, 2 is quadratic
+    slope = np.polyfit(np.log(sizes), np.log(times), 1)[0]
+    print(f'scaling exponent: {slope:.2f}')
+
+
+if __name__ == '__main__':
+    run()
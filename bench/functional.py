@@ -0,0 +1,69 @@
+'''
+Per-element throughput of kaitorch.functional: one float per call, as the
+Scalar path uses it, against the math-based functions it replaced, and
+one call over a whole ndarray.
+
+    python -m kaitorch.bench.functional
+'''
+import math
+
+import numpy as np
+
+import kaitorch.functional as F
+from kaitorch.bench.suite import measure
+
+
+# The per-float implementations kaitorch.functional replaced, as they were.
+
+def sigmoid(x):
+    if x < 0:
+        return math.exp(x) / (1 + math.exp(x))
+    return 1 / (1 + math.exp(-x))
+
+
+def tanh(x):
+    return (math.exp(2 * x) - 1) / (math.exp(2 * x) + 1)
+
+
+def swish(x, beta=1.0):
+    return x * sigmoid(x * beta)
+
+
+BASELINE = {
+    'sigmoid': sigmoid,
+    'd_sigmoid': lambda x: sigmoid(x) * (1 - sigmoid(x)),
+    'tanh': tanh,
+    'd_tanh': lambda x: 1 - tanh(x) ** 2,
+    'ReLU': lambda x: 0 if x < 0 else x,
+    'd_ReLU': lambda x: (x > 0) * 1,
+    'LeakyReLU': lambda x, alpha=0.1: x * alpha if x < 0 else x,
+    'd_LeakyReLU': lambda x, alpha=0.1: alpha if x < 0 else 1,
+    'ELU': lambda x, alpha=1.0: alpha * (math.exp(x) - 1) if x < 0 else x,
+    'd_ELU': lambda x, alpha=1.0: alpha * math.exp(x) if x < 0 else 1,
+    'swish': swish,
+    'd_swish': lambda x, beta=1.0: swish(x, beta) + sigmoid(beta * x) * (1 - swish(x, beta)),
+}
+
+
+def rate(fn, n, repeat=3):
+    return n / measure(fn, repeat)
+
+
+def run(n_scalar=20_000, n_array=1_000_000):
+    rng = np.random.default_rng(0)
+    # within the range the old tanh and sigmoid could take without overflow
+    floats = rng.normal(scale=5, size=n_scalar).tolist()
+    array = rng.normal(scale=5, size=n_array)
+
+    print(f"{'':<14}{'per float, elem/s':^34}{'per array':>16}")
+    print(f"{'function':<14}{'before':>12}{'after':>12}{'change':>10}{'elem/s':>16}")
+    for name, old in BASELINE.items():
+        fn = getattr(F, name)
+        before = rate(lambda: [old(v) for v in floats], n_scalar)
+        after = rate(lambda: [fn(v) for v in floats], n_scalar)
+        vector = rate(lambda: fn(array), n_array)
+        print(f'{name:<14}{before:>12,.0f}{after:>12,.0f}{after / before:>9.2f}x{vector:>16,.0f}')
+
+
+if __name__ == '__main__':
+    run()
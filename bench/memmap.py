@@ -0,0 +1,89 @@
+'''
+Reading a .npy dataset end to end: MemmapDataset against the same file
+through np.load(mmap_mode='r') and loaded whole. Each reader runs in a
+fresh forked process and reports throughput and its peak resident memory
+above the process's baseline (resource.getrusage).
+
+    python -m kaitorch.bench.memmap
+'''
+import multiprocessing as mp
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+
+from kaitorch.data import MemmapDataset
+
+
+def write(path, n, features, chunk=65_536):
+    # streamed to disk in chunks, so writing never holds the dataset in memory
+    rng = np.random.default_rng(0)
+    with open(path, 'wb') as f:
+        np.lib.format.write_array_header_1_0(f, {'descr': '<f8', 'fortran_order': False, 'shape': (n, features)})
+        for i in range(0, n, chunk):
+            f.write(rng.normal(size=(min(chunk, n - i), features)).tobytes())
+
+
+def peak_rss():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def read_dataset(path, batch_size, shuffle):
+    total = 0.0
+    for x_batch in MemmapDataset(path, batch_size=batch_size, shuffle=shuffle):
+        total += x_batch.sum()
+    return total
+
+
+def read_memmap(path, batch_size, shuffle):
+    x = np.load(path, mmap_mode='r')
+    total = 0.0
+    for i in range(0, len(x), batch_size):
+        total += x[i:i + batch_size].sum()
+    return total
+
+
+def read_whole(path, batch_size, shuffle):
+    x = np.load(path)
+    total = 0.0
+    for i in range(0, len(x), batch_size):
+        total += x[i:i + batch_size].sum()
+    return total
+
+
+def measure(reader, path, batch_size, shuffle, pipe):
+    base = peak_rss()
+    start = time.perf_counter()
+    reader(path, batch_size, shuffle)
+    pipe.send((time.perf_counter() - start, peak_rss() - base))
+
+
+def run(n=1_000_000, features=64, batch_size=1024):
+    ctx = mp.get_context('fork')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'x.npy')
+        write(path, n, features)
+        size = os.path.getsize(path)
+
+        print(f'{n} records x {features} features, {size / 2**20:,.0f} MB, batches of {batch_size}')
+        print(f"{'reader':<26}{'time (s)':>10}{'MB/s':>10}{'peak RSS (MB)':>16}")
+        for name, reader, shuffle in (
+            ('MemmapDataset', read_dataset, False),
+            ('MemmapDataset shuffled', read_dataset, True),
+            ('np.load mmap_mode=r', read_memmap, False),
+            ('np.load', read_whole, False),
+        ):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(target=measure, args=(reader, path, batch_size, shuffle, child))
+            process.start()
+            t, rss = parent.recv()
+            process.join()
+            print(f'{name:<26}{t:>10.2f}{size / 2**20 / t:>10,.0f}{rss / 2**20:>16,.1f}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,70 @@
+'''
+Memory per graph node and backward throughput of core.Scalar, and the
+fused Scalar.dot against the equivalent chain of products and sums.
+
+    python -m kaitorch.bench.nodes
+'''
+import tracemalloc
+
+from kaitorch.bench.suite import measure
+from kaitorch.core import Scalar, build_topo
+
+
+def graph(n):
+    # n multiply-add pairs hanging off one input, reduced to one output
+    x = Scalar(0.5)
+    out = Scalar(0.0)
+    for i in range(n):
+        out = out + x * float(i)
+    return out
+
+
+def bytes_per_node(n):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    root = graph(n)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # n constants, n products, n sums
+    nodes = 3 * n
+    del root
+    return (after - before) / nodes
+
+
+def backward_rate(n, repeat=3):
+    root = graph(n)
+    return 3 * n / measure(lambda: root.backward(retain_graph=True), repeat)
+
+
+def unit(nin, fused):
+    # one Dense-style unit: b + Σ w_i * x_i
+    ws = [Scalar(0.01 * i) for i in range(nin)]
+    xs = [Scalar(1.0) for _ in range(nin)]
+    b = Scalar(0.0)
+    if fused:
+        return Scalar.dot(ws, xs, b)
+    return sum((wi * xi for wi, xi in zip(ws, xs)), b)
+
+
+def dot_rate(nin, fused, repeat=5):
+    root = unit(nin, fused)
+    nodes = sum(1 for node in build_topo(root) if node._op)
+    return nodes, measure(lambda: root.backward(retain_graph=True), repeat)
+
+
+def run(sizes=(10_000, 100_000), fan_ins=(16, 256, 4096)):
+    print(f"{'nodes':>10}{'bytes/node':>14}{'backward nodes/s':>20}")
+    for n in sizes:
+        print(f'{3 * n:>10}{bytes_per_node(n):>14.0f}{backward_rate(n):>20,.0f}')
+
+    print()
+    print(f"{'nin':>6}{'chain ops':>12}{'dot ops':>10}{'chain (ms)':>13}{'dot (ms)':>11}")
+    for nin in fan_ins:
+        chain_ops, chain_t = dot_rate(nin, fused=False)
+        dot_ops, dot_t = dot_rate(nin, fused=True)
+        print(f'{nin:>6}{chain_ops:>12}{dot_ops:>10}{chain_t * 1e3:>13.3f}{dot_t * 1e3:>11.3f}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,57 @@
+'''
+Optimizer step time against parameter count: one fused step() over every
+parameter against the per-parameter call loop, for Tensor layers and for a
+model-sized list of Scalars.
+
+    python -m kaitorch.bench.optimizers
+'''
+import numpy as np
+
+import kaitorch.optimizers as O
+from kaitorch.bench.suite import measure
+from kaitorch.core import Scalar, Tensor
+
+
+def tensors(n, layers=4):
+    # n parameters spread over weight/bias pairs, as Dense layers hold them
+    rng = np.random.default_rng(0)
+    side = max(1, int(np.sqrt(n / layers)))
+    params = []
+    for _ in range(layers):
+        params.append(Tensor(rng.normal(size=(side, side))))
+        params.append(Tensor(rng.normal(size=(side, ))))
+    for p in params:
+        p.grad = rng.normal(size=p.shape)
+    return params
+
+
+def scalars(n):
+    params = [Scalar(0.01 * i) for i in range(n)]
+    for p in params:
+        p.grad = 0.1
+    return params
+
+
+def step_time(name, params, fused, repeat=5):
+    opt = getattr(O, name)()
+
+    def loop():
+        for p in params:
+            opt(p)
+    return measure(lambda: opt.step(params), repeat) if fused else measure(loop, repeat)
+
+
+def run(tensor_sizes=(1_000, 100_000, 1_000_000), scalar_sizes=(100, 1_000)):
+    print(f"{'optimizer':<11}{'params':>8}{'count':>10}{'loop (ms)':>12}{'step (ms)':>12}{'speedup':>10}")
+    for name in O.__all__:
+        for kind, build, sizes in (('tensor', tensors, tensor_sizes), ('scalar', scalars, scalar_sizes)):
+            for n in sizes:
+                params = build(n)
+                count = sum(np.size(p.data) for p in params)
+                loop = step_time(name, params, fused=False)
+                fused = step_time(name, params, fused=True)
+                print(f'{name:<11}{kind:>8}{count:>10,}{loop * 1e3:>12.3f}{fused * 1e3:>12.3f}{loop / fused:>9.1f}x')
+
+
+if __name__ == '__main__':
+    run()
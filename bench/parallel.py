@@ -0,0 +1,80 @@
+'''
+Data-parallel fit: epoch time and speedup against the number of worker
+processes, for a model large enough that each shard's forward and
+backward outweighs the per-batch pipe and shared memory traffic. Then
+parallel predict: rows/s against workers, checked bit for bit against
+the single-process result. Pin
+BLAS to one thread per process so workers do not oversubscribe cores.
+
+    OMP_NUM_THREADS=1 python -m kaitorch.bench.parallel
+'''
+import os
+
+import numpy as np
+
+import kaitorch.losses as L
+import kaitorch.optimizers as O
+from kaitorch.bench.suite import measure, quiet
+from kaitorch.layers import Dense
+from kaitorch.models import Sequential
+
+
+def model(width, seed=0):
+    m = Sequential([Dense(width, 'ReLU'), Dense(width, 'ReLU'), Dense(1, 'sigmoid')], seed=seed)
+    m.compile(O.SGD(), L.binary_crossentropy())
+    return m
+
+
+def epoch_time(workers, x, y, width, batch_size, repeat=2):
+    m = model(width)
+    with quiet():
+        return measure(
+            lambda: m.fit(x, y, epochs=1, batch_size=batch_size, shuffle=False, workers=workers), repeat, min_time=0
+        )
+
+
+def predict_time(workers, m, x, chunk_size, repeat=2):
+    with quiet():
+        seconds = measure(
+            lambda: m.predict(x, as_scalar=True, batch_size=chunk_size, workers=workers), repeat, min_time=0
+        )
+        out = m.predict(x, as_scalar=True, batch_size=chunk_size, workers=workers)
+    return seconds, out.data
+
+
+def run(n=32_768, features=64, width=512, batch_size=4096, workers=(1, 2, 4, 8, 16, 32),
+        n_predict=1_000_000, chunk_size=8192):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(n, features))
+    y = (x[:, 0] > 0).astype(np.float64)
+
+    cores = os.cpu_count()
+    print(f'{n} records, width {width}, batch {batch_size}, {cores} cores')
+    print(f"{'workers':>8}{'epoch (s)':>12}{'records/s':>14}{'speedup':>10}")
+    base = None
+    for w in workers:
+        if w > cores:
+            break
+        t = epoch_time(w, x, y, width, batch_size)
+        base = base or t
+        print(f'{w:>8}{t:>12.3f}{n / t:>14,.0f}{base / t:>9.1f}x')
+
+    x = rng.normal(size=(n_predict, features))
+    m = model(width)
+    m.build(features)
+
+    print()
+    print(f'predict {n_predict} records, chunks of {chunk_size}')
+    print(f"{'workers':>8}{'time (s)':>12}{'rows/s':>14}{'speedup':>10}{'exact':>8}")
+    base, reference = None, None
+    for w in workers:
+        if w > cores:
+            break
+        t, out = predict_time(w, m, x, chunk_size)
+        if base is None:
+            base, reference = t, out
+        print(f'{w:>8}{t:>12.3f}{n_predict / t:>14,.0f}{base / t:>9.1f}x{str(np.array_equal(out, reference)):>8}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,88 @@
+'''
+Start-up and prediction latency of kaitorch.runtime against
+Sequential.predict: import time and cold start - import, load a
+checkpoint, predict one record - in fresh interpreters, and per-call
+latency in a warm one.
+
+    python -m kaitorch.bench.runtime
+'''
+import os
+import subprocess
+import sys
+import tempfile
+import warnings
+
+import numpy as np
+
+from kaitorch.bench.suite import measure, quiet
+
+SIZES = (64, 256, 256, 10)
+
+COLD = '''
+import time
+start = time.perf_counter()
+{imports}
+imported = time.perf_counter()
+model = {load}
+model.predict(np.ones((1, {features})){args})
+done = time.perf_counter()
+print(imported - start, done - start)
+'''
+
+BASELINE = '''
+import time
+start = time.perf_counter()
+import numpy
+print(time.perf_counter() - start)
+'''
+
+STACKS = {
+    'runtime': ('import numpy as np\nfrom kaitorch.runtime import Runtime', 'Runtime.load(path)', ''),
+    'models': ('import numpy as np\nfrom kaitorch.models import Sequential', 'Sequential.load(path)', ', as_scalar=True'),
+}
+
+
+def fresh(code, repeat):
+    # the best of several runs, each in a new interpreter with the
+    # caller's import path
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True)
+        runs.append([float(t) for t in out.stdout.split()])
+    return [min(column) for column in zip(*runs)]
+
+
+def run(repeat=5):
+    from kaitorch.layers import Dense
+    from kaitorch.models import Sequential
+    from kaitorch.runtime import Runtime
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.kt')
+        model = Sequential([Dense(n, 'ReLU') for n in SIZES[1:-1]] + [Dense(SIZES[-1], 'softmax')], seed=0)
+        model.build(SIZES[0])
+        model.save(path)
+
+        print(f'model {list(SIZES)}, fresh interpreter, best of {repeat}')
+        print(f"{'':<26}{'import (ms)':>14}{'cold start (ms)':>18}")
+        imported, = fresh(BASELINE, repeat)
+        print(f"{'numpy':<26}{imported * 1e3:>14.1f}{'':>18}")
+        for name, (imports, load, args) in STACKS.items():
+            code = COLD.format(imports=imports, load=load, features=SIZES[0], args=args)
+            imported, done = fresh(f'path = {path!r}\n' + code, repeat)
+            print(f"{name:<26}{imported * 1e3:>14.1f}{done * 1e3:>18.1f}")
+
+        runtime = Runtime.load(path)
+        warnings.simplefilter('ignore')
+        print(f"\n{'predict':<26}{'runtime (ms)':>14}{'models (ms)':>18}")
+        for records in (1, 1_024):
+            x = np.random.default_rng(0).normal(size=(records, SIZES[0]))
+            fast = measure(lambda: runtime.predict(x))
+            with quiet():
+                slow = measure(lambda: model.predict(x, as_scalar=True))
+            print(f"{f'{records:,} records':<26}{fast * 1e3:>14.3f}{slow * 1e3:>18.3f}")
+
+
+if __name__ == '__main__':
+    run()
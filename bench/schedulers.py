@@ -0,0 +1,70 @@
+'''
+Epochs and training time to a target loss with a constant learning rate
+and with each schedule, at a range of starting rates, on a noisy linear
+regression whose noise puts the lowest reachable loss near 0.09.
+
+    python -m kaitorch.bench.schedulers
+'''
+import time
+
+import numpy as np
+
+from kaitorch import schedulers as S
+from kaitorch.bench.suite import quiet
+from kaitorch.layers import Dense
+from kaitorch.losses import mse
+from kaitorch.models import Sequential
+from kaitorch.optimizers import Momentum
+
+RECORDS = 4_096
+FEATURES = 16
+BATCH_SIZE = 32
+EPOCHS = 20
+STEPS = EPOCHS * -(-RECORDS // BATCH_SIZE)
+
+
+def schedules():
+    return {
+        'constant': None,
+        'step': S.StepDecay(5, 0.3),
+        'exponential': S.ExponentialDecay(0.8, interval='epoch'),
+        'cosine': S.CosineDecay(STEPS),
+        'warmup + cosine': S.Warmup(STEPS // EPOCHS, S.CosineDecay(STEPS - STEPS // EPOCHS)),
+        'plateau': S.ReduceOnPlateau(0.3, patience=0),
+    }
+
+
+def train(x, y, lr, scheduler, target):
+    model = Sequential([Dense(32, 'ReLU'), Dense(1)], seed=0)
+    model.compile(Momentum(lr=lr), mse())
+
+    seconds, reached, losses = 0.0, None, []
+    for epoch in range(1, EPOCHS + 1):
+        with quiet():
+            # each epoch timed once - the loss follows the whole run
+            start = time.perf_counter()
+            # the scheduler stays with the model after the first fit
+            model.fit(x, y, epochs=1, batch_size=BATCH_SIZE, scheduler=scheduler if epoch == 1 else None)
+            seconds += time.perf_counter() - start
+            losses.append(model.evaluate(x, y)['loss'][0])
+        if reached is None and losses[-1] <= target:
+            reached = (epoch, seconds)
+    return losses, reached
+
+
+def run(lrs=(0.03, 0.1, 0.3), target=0.09):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(RECORDS, FEATURES))
+    y = x @ rng.normal(size=FEATURES) + 0.3 * rng.normal(size=RECORDS)
+
+    print(f'Momentum SGD, {EPOCHS} epochs, target loss {target}')
+    print(f"{'lr':>6}  {'schedule':<18}{'final loss':>12}{'epochs':>9}{'seconds':>10}")
+    for lr in lrs:
+        for name, scheduler in schedules().items():
+            losses, reached = train(x, y, lr, scheduler, target)
+            epochs, seconds = (f'{reached[0]}', f'{reached[1]:.2f}') if reached else ('-', '-')
+            print(f'{lr:>6}  {name:<18}{losses[-1]:>12.4f}{epochs:>9}{seconds:>10}')
+
+
+if __name__ == '__main__':
+    run()
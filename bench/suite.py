@@ -0,0 +1,332 @@
+'''
+The benchmark suite: micro benchmarks of core ops, activations, losses and
+optimizers, and macro benchmarks of Sequential.fit and predict. Each case
+is timed as the best of several repeats of a call, and recorded as seconds
+per call alongside how many items - ops, elements, records - one call does.
+'''
+import contextlib
+import io
+import json
+import platform
+import re
+import time
+import timeit
+
+import numpy as np
+
+import kaitorch.activations as A
+import kaitorch.losses as L
+import kaitorch.optimizers as O
+from kaitorch.core import Scalar, Tensor
+from kaitorch.layers import Dense, Dropout
+from kaitorch.models import Sequential
+
+CASES = {}
+
+
+def case(name, items, unit):
+    '''
+    Register a case. The decorated function does its setup and returns the
+    function to time; one call of that does items units of work.
+    '''
+    def register(setup):
+        CASES[name] = (setup, items, unit)
+        return setup
+    return register
+
+
+def measure(fn, repeat=5, min_time=0.05):
+    # calls per repeat are chosen so a repeat takes at least min_time
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return min(timer.repeat(repeat, number)) / number
+
+
+def settle_allocator():
+    # glibc hands out large blocks as fresh mmaps - page faults on every
+    # allocation - until a block that large has been freed once, then
+    # reuses heap memory. Free a big block up front, so a case times the
+    # same whichever cases ran before it.
+    block = np.ones(2 ** 21)
+    del block
+
+
+@contextlib.contextmanager
+def quiet():
+    # progress bars go to stderr and would bury the report
+    with contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+# Scalar
+
+SCALAR_OPS = 1_000
+
+
+def scalar_op(op):
+    def setup():
+        xs = [Scalar(0.5 + i / SCALAR_OPS) for i in range(SCALAR_OPS)]
+        return lambda: [op(x) for x in xs]
+    return setup
+
+
+for _name, _op in (
+    ('add', lambda x: x + x),
+    ('mul', lambda x: x * x),
+    ('pow', lambda x: x ** 2),
+    ('exp', lambda x: x.exp()),
+    ('log', lambda x: x.log()),
+):
+    case(f'scalar.{_name}', SCALAR_OPS, 'ops')(scalar_op(_op))
+
+
+@case('scalar.dot', SCALAR_OPS, 'terms')
+def scalar_dot():
+    ws = [Scalar(0.01 * i) for i in range(SCALAR_OPS)]
+    xs = [Scalar(1.0) for _ in range(SCALAR_OPS)]
+    return lambda: Scalar.dot(ws, xs)
+
+
+@case('scalar.backward', 30_000, 'nodes')
+def scalar_backward():
+    # 10,000 multiply-add pairs on one input: 30,000 nodes
+    x = Scalar(0.5)
+    out = Scalar(0.0)
+    for i in range(10_000):
+        out = out + x * float(i)
+    # kept, so every call runs through the same graph
+    return lambda: out.backward(retain_graph=True)
+
+
+# Tensor
+
+@case('tensor.matmul', 256 * 256 * 256, 'MACs')
+def tensor_matmul():
+    a, b = Tensor(np.ones((256, 256))), Tensor(np.ones((256, 256)))
+    return lambda: a @ b
+
+
+@case('tensor.backward', 256 * 256, 'elements')
+def tensor_backward():
+    rng = np.random.default_rng(0)
+    x, w = Tensor(rng.normal(size=(256, 256))), Tensor(rng.normal(size=(256, 256)))
+    out = ((x @ w).activation('tanh') * 0.5).sum()
+    return lambda: out.backward(retain_graph=True)
+
+
+# Activations - forward and backward over a batch
+
+ELEMENTS = 128 * 256
+
+# parameterised activations warn when left to their defaults
+ACTIVATION_ARGS = {'LeakyReLU': (0.01, ), 'ELU': (1.0, ), 'swish': (1.0, )}
+
+
+def activation(name):
+    def setup():
+        x = Tensor(np.random.default_rng(0).normal(size=(128, 256)))
+        if name == 'softmax':
+            forward = A.softmax
+        else:
+            forward = getattr(A, name)(*ACTIVATION_ARGS.get(name, ()))
+
+        def run():
+            forward(x).sum().backward()
+        return run
+    return setup
+
+
+for _name in A.__all__:
+    case(f'activation.{_name}', ELEMENTS, 'elements')(activation(_name))
+
+
+@case('layer.dropout', ELEMENTS, 'elements')
+def dropout():
+    x = Tensor(np.random.default_rng(0).normal(size=(128, 256)))
+    layer = Dropout(0.5, seed=0)
+    layer.__build__(256)
+
+    def run():
+        layer(x, True).sum().backward()
+    return run
+
+
+# Losses - forward and backward over a batch of predictions
+
+RECORDS = 1_024
+
+
+def loss(name):
+    def setup():
+        rng = np.random.default_rng(0)
+        logits = rng.normal(size=(RECORDS, 10))
+        labels = rng.integers(0, 10, size=RECORDS)
+        onehot = np.eye(10)[labels]
+        probs = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+
+        fn = getattr(L, name)()
+        y, pred = {
+            'mse': (rng.normal(size=(RECORDS, 10)), logits),
+            'binary_crossentropy': (onehot, probs),
+            'categorical_crossentropy': (onehot, probs),
+            'softmax_crossentropy': (labels, logits),
+        }[name]
+
+        def run():
+            fn(y, Tensor(pred)).backward()
+        return run
+    return setup
+
+
+for _name in L.__all__:
+    case(f'loss.{_name}', RECORDS, 'records')(loss(_name))
+
+
+# Optimizers - one step over the parameters of a mid-sized model
+
+PARAMS = (256, 256, 256, 1)
+N_PARAMS = sum(i * o + o for i, o in zip(PARAMS, PARAMS[1:]))
+
+
+def optimizer(name):
+    def setup():
+        rng = np.random.default_rng(0)
+        params = []
+        for nins, nouts in zip(PARAMS, PARAMS[1:]):
+            params += [Tensor(rng.normal(size=(nins, nouts))), Tensor(rng.normal(size=(nouts, )))]
+        for p in params:
+            p.grad = rng.normal(size=p.shape)
+        opt = getattr(O, name)()
+        return lambda: opt.step(params)
+    return setup
+
+
+for _name in O.__all__:
+    case(f'optimizer.{_name}', N_PARAMS, 'params')(optimizer(_name))
+
+
+# Sequential - fit and predict on synthetic data
+
+N = 4_096
+FEATURES = 16
+
+
+def data(task):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(N, FEATURES))
+    if task == 'regression':
+        y = x @ rng.normal(size=FEATURES) + 0.1 * rng.normal(size=N)
+    else:
+        y = np.argmax(x[:, :4], axis=1)
+    return x, y
+
+
+def model(task, width, depth):
+    m = Sequential([Dense(width, 'ReLU') for _ in range(depth)], seed=0)
+    if task == 'regression':
+        m.add(Dense(1))
+        m.compile(O.Adam(), L.mse())
+    else:
+        m.add(Dense(4))
+        m.compile(O.Adam(), L.softmax_crossentropy())
+    m.build(FEATURES)
+    return m
+
+
+def fit(task, width, depth, profiled=False):
+    def setup():
+        x, y = data(task)
+        m = model(task, width, depth)
+        if profiled:
+            m.profile()
+
+        def run():
+            with quiet():
+                m.fit(x, y, epochs=1, batch_size=128)
+        return run
+    return setup
+
+
+def predict(task, width, depth):
+    def setup():
+        x, _ = data(task)
+        m = model(task, width, depth)
+
+        def run():
+            with quiet():
+                m.predict(x, batch_size=1_024)
+        return run
+    return setup
+
+
+for _task in ('regression', 'classification'):
+    for _width in (16, 128):
+        for _depth in (1, 3):
+            case(f'fit.{_task}.w{_width}.d{_depth}', N, 'records')(fit(_task, _width, _depth))
+            case(f'predict.{_task}.w{_width}.d{_depth}', N, 'records')(predict(_task, _width, _depth))
+
+# the same fit with a Profiler attached, for its overhead
+case('fit.regression.w16.d3.profiled', N, 'records')(fit('regression', 16, 3, profiled=True))
+
+
+def run(pattern=None, repeat=5, min_time=0.05, log=print):
+    '''
+    Time every case whose name matches the regular expression pattern.
+    Returns a JSON-ready dict of the machine it ran on and the results.
+    '''
+    settle_allocator()
+
+    results = {}
+    for name, (setup, items, unit) in CASES.items():
+        if pattern and not re.search(pattern, name):
+            continue
+        fn = setup()
+        seconds = measure(fn, repeat, min_time)
+        results[name] = {'seconds': seconds, 'items': items, 'unit': unit}
+        log(f'{name:<42}{seconds * 1e3:>12.3f} ms{items / seconds:>16,.0f} {unit}/s')
+
+    return {
+        'meta': {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+        },
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=0.10, log=print):
+    '''
+    Set current's times against baseline's, case by case. A case more than
+    threshold slower is a regression. Returns the names of regressions.
+    '''
+    regressions = []
+    log(f"{'case':<42}{'baseline (ms)':>15}{'current (ms)':>15}{'change':>10}")
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            log(f'{name:<42}{"-":>15}{result["seconds"] * 1e3:>15.3f}{"new":>10}')
+            continue
+        before, after = baseline['results'][name]['seconds'], result['seconds']
+        change = after / before - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif change < -threshold:
+            flag = '  faster'
+        log(f'{name:<42}{before * 1e3:>15.3f}{after * 1e3:>15.3f}{change:>+10.1%}{flag}')
+    return regressions
+
+
+def dump(report, path):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,247 @@
+import json
+import mmap
+import os
+
+import numpy as np
+
+__all__ = ['save', 'load', 'write', 'read']
+
+# File layout:
+#   magic    8 bytes    b'KAITORCH'
+#   version  uint32     little-endian
+#   length   uint64     little-endian, bytes of JSON header
+#   header   JSON       architecture, optimizer, loss and an index of arrays
+#   padding             up to the next ALIGN boundary
+#   arrays   float64    little-endian, each starting on an ALIGN boundary
+#
+# Every array is addressed by its byte offset from the start of the array
+# section, so a loader can map the file once and hand out views.
+
+MAGIC = b'KAITORCH'
+VERSION = 1
+ALIGN = 64
+
+
+def align(n):
+    return -(-n // ALIGN) * ALIGN
+
+
+def write(path, header, arrays):
+    '''
+    Write a header dict and a dict of named arrays to one checkpoint file.
+    '''
+    index, offset = {}, 0
+    for name, array in arrays.items():
+        shape = np.shape(array)
+        index[name] = {'shape': list(shape), 'offset': offset}
+        offset = align(offset + int(np.prod(shape)) * 8)
+
+    blob = json.dumps(dict(header, arrays=index)).encode('utf-8')
+    start = align(len(MAGIC) + 4 + 8 + len(blob))
+
+    # written beside path and moved over it, so a model still mapped from
+    # an older file at path never sees it truncated
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(np.uint32(VERSION).tobytes())
+        f.write(np.uint64(len(blob)).tobytes())
+        f.write(blob)
+        for name, array in arrays.items():
+            f.write(b'\0' * (start + index[name]['offset'] - f.tell()))
+            f.write(np.ascontiguousarray(array, dtype='<f8').data)
+    os.replace(tmp, path)
+
+
+def read(path, mmap_mode='c'):
+    '''
+    Read a checkpoint's header and arrays. With mmap_mode 'r' (read-only)
+    or 'c' (copy-on-write) the arrays are views into one memory map of the
+    file and nothing is read until it is touched; with None they are read
+    into memory.
+    '''
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise Exception(f'[Invalid Checkpoint] - {path} is not a kaitorch checkpoint')
+        version = int(np.frombuffer(f.read(4), dtype='<u4')[0])
+        if version != VERSION:
+            raise Exception(f'[Invalid Checkpoint] - Unsupported checkpoint version {version}')
+        length = int(np.frombuffer(f.read(8), dtype='<u8')[0])
+        header = json.loads(f.read(length).decode('utf-8'))
+        start = align(len(MAGIC) + 4 + 8 + length)
+
+        if mmap_mode is None:
+            f.seek(0, 2)
+            buffer = bytearray(f.tell() - start)
+            f.seek(start)
+            f.readinto(buffer)
+            start = 0
+        elif mmap_mode in ('r', 'c'):
+            access = mmap.ACCESS_READ if mmap_mode == 'r' else mmap.ACCESS_COPY
+            buffer = mmap.mmap(f.fileno(), 0, access=access)
+        else:
+            raise Exception(f'[Invalid Mode] - mmap_mode must be "r", "c" or None, not "{mmap_mode}"')
+
+    arrays = {}
+    for name, entry in header.pop('arrays').items():
+        shape = tuple(entry['shape'])
+        count = int(np.prod(shape))
+        arrays[name] = np.frombuffer(buffer, dtype='<f8', count=count, offset=start + entry['offset']).reshape(shape)
+
+    return header, arrays
+
+
+def save(model, path):
+    '''
+    Save a built Sequential - its layers, weights and, once compiled, its
+    optimizer with its moment buffers and its loss - to one file.
+    '''
+    from kaitorch.layers import Dense, Dropout
+
+    if not model.built:
+        raise Exception('[Model Not Built] - Use Sequential.build(input_size) to build model')
+
+    layers, arrays = [], {}
+    for i, layer in enumerate(model.layers):
+        if isinstance(layer, Dense):
+            activation = layer.activation
+            if activation is not None and not isinstance(activation, str):
+                activation = {'name': type(activation).__name__, 'params': vars(activation)}
+            layers.append({
+                'type': 'Dense',
+                'nouts': layer.nouts,
+                'activation': activation,
+                'initializer': repr(layer.initializer),
+            })
+        elif isinstance(layer, Dropout):
+            # the generator's position too, so masks carry on where they left off
+            layers.append({
+                'type': 'Dropout',
+                'dropout_rate': layer.q,
+                'seed': layer.seed,
+                'rng': layer.rng.bit_generator.state,
+            })
+        else:
+            raise Exception(f'[Unsupported Layer] - {type(layer).__name__} cannot be saved')
+
+        for j, p in enumerate(layer.parameters()):
+            arrays[f'{i}.{j}'] = p.data
+
+    # the model's generator shuffles every epoch, so its position is saved
+    header = {
+        'input_size': model.layer_sizes[0],
+        'seed': model.seed,
+        'rng': model.rng.bit_generator.state,
+        'layers': layers,
+    }
+
+    if model.compiled:
+        optimizer = model.optimizer
+        params = model.parameters()
+        header['optimizer'] = {
+            'type': type(optimizer).__name__,
+            'config': {k: v for k, v in vars(optimizer).items() if k not in optimizer.buffers and not k.startswith('_')},
+        }
+        header['loss'] = type(model.loss).__name__
+
+        # moment buffers exist once a parameter has been stepped
+        names = {p: name for p, name in zip(params, arrays)}
+        for buffer in optimizer.buffers:
+            for p, value in getattr(optimizer, buffer).items():
+                arrays[f'{buffer}.{names[p]}'] = value
+
+    if model.scheduler is not None:
+        header['scheduler'] = scheduler_spec(model.scheduler)
+
+    write(path, header, arrays)
+
+
+def scheduler_spec(scheduler):
+    # a schedule's settings and progress; Warmup nests the schedule it hands over to
+    from kaitorch.schedulers import Scheduler
+
+    config = {}
+    for k, v in vars(scheduler).items():
+        if k != 'optimizer':
+            config[k] = scheduler_spec(v) if isinstance(v, Scheduler) else v
+    return {'type': type(scheduler).__name__, 'config': config}
+
+
+def scheduler_from_spec(spec):
+    from kaitorch import schedulers as S
+
+    # restored attribute by attribute, progress included, rather than through __init__
+    scheduler = object.__new__(getattr(S, spec['type']))
+    for k, v in spec['config'].items():
+        setattr(scheduler, k, scheduler_from_spec(v) if isinstance(v, dict) and 'type' in v else v)
+    scheduler.optimizer = None
+    return scheduler
+
+
+def load(path, mmap_mode='c'):
+    '''
+    Rebuild the Sequential saved at path. Weights and moment buffers are
+    views into a memory map of the file unless mmap_mode is None; the
+    default copy-on-write map never writes back to the file.
+    '''
+    from kaitorch import activations as A
+    from kaitorch import losses as L
+    from kaitorch import optimizers as O
+    from kaitorch import initializers as I
+    from kaitorch.core import Tensor
+    from kaitorch.layers import Dense, Dropout
+    from kaitorch.models import Sequential
+    from kaitorch.utils import ffill
+
+    header, arrays = read(path, mmap_mode)
+
+    layers = []
+    for spec in header['layers']:
+        if spec['type'] == 'Dense':
+            activation = spec['activation']
+            if isinstance(activation, dict):
+                activation = getattr(A, activation['name'])(**activation['params'])
+            # weights come from the file, so an unknown initializer only affects rebuilding
+            initializer = spec['initializer'] if spec['initializer'] in I.__all__ else 'glorot_uniform'
+            layers.append(Dense(spec['nouts'], activation, initializer))
+        else:
+            layer = Dropout(spec['dropout_rate'], spec.get('seed'))
+            if 'rng' in spec:
+                layer.rng.bit_generator.state = spec['rng']
+            layers.append(layer)
+
+    model = Sequential(layers, seed=header.get('seed'))
+    if 'rng' in header:
+        model.rng.bit_generator.state = header['rng']
+
+    # built from the file rather than by Sequential.build, which would
+    # first sample every weight from its initializer
+    model.layer_sizes.insert(0, header['input_size'])
+    model.layer_sizes = ffill(model.layer_sizes)
+    names = {}
+    for i, layer in enumerate(model.layers):
+        if isinstance(layer, Dense):
+            layer.nins = model.layer_sizes[i]
+            layer.w, layer.b = Tensor(arrays[f'{i}.0']), Tensor(arrays[f'{i}.1'])
+        else:
+            layer.__build__(model.layer_sizes[i])
+        for j, p in enumerate(layer.parameters()):
+            names[f'{i}.{j}'] = p
+    model.built = True
+
+    if 'optimizer' in header:
+        optimizer = getattr(O, header['optimizer']['type'])()
+        vars(optimizer).update(header['optimizer']['config'])
+        for buffer in optimizer.buffers:
+            setattr(optimizer, buffer, {})
+            for name, p in names.items():
+                if f'{buffer}.{name}' in arrays:
+                    getattr(optimizer, buffer)[p] = arrays[f'{buffer}.{name}']
+        model.compile(optimizer, getattr(L, header['loss'])())
+
+    if 'scheduler' in header:
+        model.scheduler = scheduler_from_spec(header['scheduler'])
+        if model.compiled:
+            model.scheduler.attach(model.optimizer)
+
+    return model
@@ -1,6 +1,128 @@
+import functools
 import math
 
-__all__ = ['Scalar', 'Module']
+import numpy as np
+
+__all__ = ['Scalar', 'Tensor', 'Module', 'no_grad', 'build_topo', 'backprop', 'replay', 'op_label']
+
+
+# Op codes - every node records one of these plus a tuple of its inputs,
+# and backward looks the gradient rule up by code instead of calling a
+# closure stored on the node
+LEAF, ADD, MUL, POW, EXP, LOG, ACT, MATMUL, SUM, STOP, DOT, SOFTMAX_CE = range(12)
+
+OP_NAMES = ('', '+', '*', '**', 'exp', 'ln', 'act', '@', 'sum', 'stop', 'dot', 'softmax_ce')
+
+
+# Cleared inside no_grad(): new nodes then keep their value but no inputs
+_grad_enabled = True
+
+
+class no_grad:
+    '''
+    Context in which ops compute values without recording the graph -
+    no parent links are kept, so nothing is retained for backward.
+    '''
+
+    def __enter__(self):
+        global _grad_enabled
+        self.prev = _grad_enabled
+        _grad_enabled = False
+
+    def __exit__(self, *args):
+        global _grad_enabled
+        _grad_enabled = self.prev
+
+
+def op_label(node):
+    '''
+    Display name of the op that produced node ('' for leaves).
+    '''
+    if node._op == POW:
+        return f'**{node._arg}'
+    if node._op == ACT:
+        return type(node._arg).__name__
+    return OP_NAMES[node._op]
+
+
+def build_topo(root, stop=()):
+    '''
+    Nodes reachable from root in topological order (inputs before outputs).
+    Uses an explicit stack, so graph depth is not bound by the recursion limit.
+    Nodes in stop are neither visited nor returned.
+    '''
+    topo = []
+    visited = set(stop)
+    visited.add(root)
+    stack = [(root, iter(root._prev))]
+
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if child not in visited:
+                visited.add(child)
+                stack.append((child, iter(child._prev)))
+                break
+        else:
+            stack.pop()
+            # checked inline - this loop runs once per node
+            if node._op and not node._prev:
+                check_retained(node)
+            topo.append(node)
+
+    return topo
+
+
+def check_retained(node):
+    # an op node without inputs was released by an earlier backward - one
+    # through this graph, or through another that shares this node
+    if node._op and not node._prev:
+        raise Exception(
+            '[Graph Released] - Backward already ran through this graph; '
+            'pass retain_graph=True to the first backward to run it again'
+        )
+
+
+def backprop(topo, release=False, hook=None):
+    '''
+    Apply each node's gradient rule, in reverse topological order.
+
+    With release, topo is emptied as it goes and each node drops its
+    inputs once its rule has run - every node that reads its data has run
+    by then - so the graph is freed during the pass rather than after it.
+
+    A hook, if given, is called as hook(rule, node) in place of each
+    rule(node), and must run the rule - the profiler times them this way.
+    '''
+    if not topo:
+        return
+    table = _TENSOR_BACKWARD if isinstance(topo[-1], Tensor) else _SCALAR_BACKWARD
+    if hook is not None:
+        table = {op: functools.partial(hook, rule) for op, rule in table.items()}
+    if not release:
+        for node in reversed(topo):
+            if node._op:
+                table[node._op](node)
+        return
+    while topo:
+        node = topo.pop()
+        if node._op:
+            table[node._op](node)
+            node._prev = ()
+            node._arg = None
+
+
+def replay(topo):
+    '''
+    Recompute each node's data from its inputs, in topological order.
+    Lets a recorded graph be re-run on new leaf values without rebuilding it.
+    '''
+    if not topo:
+        return
+    table = _TENSOR_FORWARD if isinstance(topo[-1], Tensor) else _SCALAR_FORWARD
+    for node in topo:
+        if node._op:
+            table[node._op](node)
 
 
 class Module:
@@ -13,72 +135,218 @@ class Module:
         return []
 
 
+def _softmax_crossentropy(z, ys):
+    '''
+    Per-row cross entropy of softmax(z) against ys, and softmax(z) itself.
+    ys holds either one class index per row or one target row per row.
+    '''
+    # log-sum-exp: shift each row by its max so exp never overflows
+    shifted = z - z.max(axis=-1, keepdims=True)
+    log_p = shifted - np.log(np.exp(shifted).sum(axis=-1, keepdims=True))
+
+    if ys.shape == z.shape:
+        nll = -(ys * log_p).sum(axis=-1)
+    else:
+        nll = -np.take_along_axis(log_p, ys[..., np.newaxis], axis=-1)[..., 0]
+    return nll, np.exp(log_p)
+
+
+def _softmax_crossentropy_grad(p, ys):
+    # Derivative: dL/dz = p * Σ y - y, which is p - y for one-hot rows
+    if ys.shape == p.shape:
+        return p * ys.sum(axis=-1, keepdims=True) - ys
+    grad = p.copy()
+    idx = ys[..., np.newaxis]
+    np.put_along_axis(grad, idx, np.take_along_axis(grad, idx, axis=-1) - 1, axis=-1)
+    return grad
+
+
+def _add_backward(y):
+    # Derivative: dy/da = 1
+    # Chain Rule: dL/da = dL/dy * dy/da
+    #                   = dL/dy
+    a, b = y._prev
+    a.grad += y.grad
+    b.grad += y.grad
+
+
+def _mul_backward(y):
+    # Derivative: dy/da = b
+    # Chain Rule: dL/da = dL/dy * dy/da
+    #                   = dL/dy * b
+    a, b = y._prev
+    a.grad += y.grad * b.data
+    b.grad += y.grad * a.data
+
+
+def _pow_backward(y):
+    # Derivative: dy/da = b * (a ** (b-1))
+    # Chain Rule: dL/da = dL/dy * dy/da
+    #                   = dL/dy * b * (a ** (b-1))
+    a, = y._prev
+    b = y._arg
+    a.grad += y.grad * (b * a.data ** (b - 1))
+
+
+def _exp_backward(y):
+    # Derivative: dy/da = y
+    # Chain Rule: dL/da = dL/dy * dy/da
+    #                   = dL/dy * y
+    a, = y._prev
+    a.grad += y.grad * y.data
+
+
+def _log_backward(y):
+    # Derivative: dy/da = 1/a * a'
+    # Chain Rule: dL/da = dL/dy * dy/da * a'
+    #                   = dL/dy * 1/a * a'
+    a, = y._prev
+    a.grad += y.grad * ((a.data + 1e-8) ** -1)
+
+
+def _act_backward(y):
+    # Chain Rule: dL/da = dL/dy * f'(y)
+    a, = y._prev
+    a.grad += y._arg.df(y.data) * y.grad
+
+
+def _stop_backward(y):
+    # Chain Rule: dL/da = 0
+    pass
+
+
+def _dot_backward(y):
+    # Derivative: dy/dw_i = x_i, dy/dx_i = w_i, dy/db = 1
+    # Chain Rule: dL/dw_i = dL/dy * x_i
+    n = y._arg
+    ins = y._prev
+    g = y.grad
+    for w, x in zip(ins[:n], ins[n:2 * n]):
+        w.grad += g * x.data
+        x.grad += g * w.data
+    ins[-1].grad += g
+
+
+def _softmax_ce_backward(y):
+    # Chain Rule: dL/dz_j = dL/dy * (p_j * Σ y - y_j), one rule for every class
+    ys, p = y._arg
+    grad = y.grad * _softmax_crossentropy_grad(p, ys)
+    for z, g in zip(y._prev, grad):
+        z.grad += g
+
+
+_SCALAR_BACKWARD = {
+    ADD: _add_backward,
+    MUL: _mul_backward,
+    POW: _pow_backward,
+    EXP: _exp_backward,
+    LOG: _log_backward,
+    ACT: _act_backward,
+    STOP: _stop_backward,
+    DOT: _dot_backward,
+    SOFTMAX_CE: _softmax_ce_backward,
+}
+
+
+def _add_forward(y):
+    a, b = y._prev
+    y.data = a.data + b.data
+
+
+def _mul_forward(y):
+    a, b = y._prev
+    y.data = a.data * b.data
+
+
+def _pow_forward(y):
+    a, = y._prev
+    y.data = (a.data + 1e-8) ** y._arg
+
+
+def _exp_forward(y):
+    a, = y._prev
+    y.data = math.exp(a.data)
+
+
+def _log_forward(y):
+    a, = y._prev
+    y.data = math.log(a.data + 1e-8)
+
+
+def _act_forward(y):
+    a, = y._prev
+    y.data = y._arg.f(a.data)
+
+
+def _stop_forward(y):
+    a, = y._prev
+    y.data = a.data
+
+
+def _dot_forward(y):
+    n = y._arg
+    ins = y._prev
+    out = ins[-1].data
+    for w, x in zip(ins[:n], ins[n:2 * n]):
+        out = out + w.data * x.data
+    y.data = out
+
+
+def _softmax_ce_forward(y):
+    ys, _ = y._arg
+    nll, p = _softmax_crossentropy(np.array([z.data for z in y._prev]), ys)
+    y.data = float(nll)
+    y._arg = (ys, p)
+
+
+_SCALAR_FORWARD = {
+    ADD: _add_forward,
+    MUL: _mul_forward,
+    POW: _pow_forward,
+    EXP: _exp_forward,
+    LOG: _log_forward,
+    ACT: _act_forward,
+    STOP: _stop_forward,
+    DOT: _dot_forward,
+    SOFTMAX_CE: _softmax_ce_forward,
+}
+
+
 class Scalar:
 
-    def __init__(self, data, _in=(), _op=''):
+    __slots__ = ('data', 'grad', '_prev', '_op', '_arg')
+
+    def __init__(self, data, _in=(), _op=LEAF, _arg=None):
         self.data = data
         self.grad = 0.0
 
-        self._backward = lambda: None
-        self._prev = set(_in)
-        self._op = _op
+        if _grad_enabled:
+            self._prev = _in
+            self._op = _op
+            self._arg = _arg
+        else:
+            self._prev = ()
+            self._op = LEAF
+            self._arg = None
 
     def __repr__(self):
         return f'Scalar(data={self.data})'
 
     def __add__(a, b):
-
-        a = a if isinstance(a, Scalar) else Scalar(a)
         b = b if isinstance(b, Scalar) else Scalar(b)
 
         # Calculation: y = a + b
-        def _forward():
-            _a = a.data
-            _b = b.data
-            _y = _a + _b
-            return Scalar(_y, _in=(a, b), _op='+')
-
-        y = _forward()
-
-        # Derivative: dy/da = 1
-        # Chain Rule: dL/da = dL/dy * dy/da
-        #                   = dL/dy
-        def _backward():
-            a.grad += y.grad
-            b.grad += y.grad
-
-        y._backward = _backward
-
-        return y
+        return Scalar(a.data + b.data, (a, b), ADD)
 
     def __radd__(a, b):
         # b + a = a + b
         return a.__add__(b)
 
     def __mul__(a, b):
-
-        a = a if isinstance(a, Scalar) else Scalar(a)
         b = b if isinstance(b, Scalar) else Scalar(b)
 
         # Calculation: y = a * b
-        def _forward():
-            _a = a.data
-            _b = b.data
-            _y = _a * _b
-            return Scalar(_y, _in=(a, b), _op='*')
-
-        y = _forward()
-
-        # Derivative: dy/da = b
-        # Chain Rule: dL/da = dL/dy * dy/da
-        #                   = dL/dy * b
-        def _backward():
-            a.grad += y.grad * b.data
-            b.grad += y.grad * a.data
-
-        y._backward = _backward
-
-        return y
+        return Scalar(a.data * b.data, (a, b), MUL)
 
     def __rmul__(a, b):
         # b * a = a * b
@@ -101,22 +369,7 @@ class Scalar:
         assert isinstance(b, (int, float)), "Exponent is not int/float"
 
         # Calculation: y = a ** b
-        def _forward():
-            _a = a.data
-            _y = (_a + 1e-8) ** b  # don't divide by 0 :)
-            return Scalar(_y, _in=(a,), _op=f'**{b}')
-
-        y = _forward()
-
-        # Derivative: dy/da = b * (a ** (b-1))
-        # Chain Rule: dL/da = dL/dy * dy/da
-        #                   = dL/dy * b * (a ** (b-1))
-        def _backward():
-            a.grad += y.grad * (b * a.data ** (b - 1))
-
-        y._backward = _backward
-
-        return y
+        return Scalar((a.data + 1e-8) ** b, (a, ), POW, b)  # don't divide by 0 :)
 
     def __truediv__(a, b):
         # a / b = a * (b ** -1)
@@ -127,44 +380,47 @@ class Scalar:
         return b.__mul__((a + 1e-8).__pow__(-1))
 
     def exp(a):
-
         # Calculation: y = e ** a
-        def _forward():
-            _a = a.data
-            _y = math.exp(_a)
-            return Scalar(_y, _in=(a, ), _op='exp')
-
-        y = _forward()
-
-        # Derivative: dy/da = y
-        # Chain Rule: dL/da = dL/dy * dy/da
-        #                   = dL/dy * y
-        def _backward():
-            a.grad += y.grad * y.data
-
-        y._backward = _backward
-
-        return y
+        return Scalar(math.exp(a.data), (a, ), EXP)
 
     def log(a):
-
         # Calculation: y = ln(a)
-        def _forward():
-            _a = a.data
-            _y = math.log(_a + 1e-8)
-            return Scalar(_y, _in=(a, ), _op='ln')
-
-        y = _forward()
-
-        # Derivative: dy/da = 1/a * a'
-        # Chain Rule: dL/da = dL/dy * dy/da * a'
-        #                   = dL/dy * 1/a * a'
-        def _backward():
-            a.grad += y.grad * ((a.data + 1e-8).__pow__(-1))
-
-        y._backward = _backward
-
-        return y
+        return Scalar(math.log(a.data + 1e-8), (a, ), LOG)
+
+    def stop_gradient(a):
+        # Calculation: y = a, but no gradient flows back into a
+        return Scalar(a.data, (a, ), STOP)
+
+    @staticmethod
+    def dot(ws, xs, bias=0.0):
+        '''
+        Fused b + Σ w_i * x_i as a single node, in place of n products and
+        n chained sums. Inputs are ws, then xs, then bias.
+        '''
+        ws = [w if isinstance(w, Scalar) else Scalar(w) for w in ws]
+        xs = [x if isinstance(x, Scalar) else Scalar(x) for x in xs]
+        bias = bias if isinstance(bias, Scalar) else Scalar(bias)
+
+        assert len(ws) == len(xs), "dot operands differ in length"
+
+        # Calculation: y = b + Σ w_i * x_i
+        y = bias.data
+        for w, x in zip(ws, xs):
+            y = y + w.data * x.data
+        return Scalar(y, (*ws, *xs, bias), DOT, len(ws))
+
+    @staticmethod
+    def softmax_crossentropy(zs, y):
+        '''
+        Cross entropy of softmax(zs) against y, fused into a single node over
+        the logits zs. y is a class index or a one-hot (or probability) list.
+        '''
+        zs = [z if isinstance(z, Scalar) else Scalar(z) for z in zs]
+        ys = np.asarray(y, dtype=np.float64 if np.ndim(y) else np.intp)
+
+        # Calculation: y = -Σ y_j * log(softmax(z)_j)
+        nll, p = _softmax_crossentropy(np.array([z.data for z in zs]), ys)
+        return Scalar(float(nll), tuple(zs), SOFTMAX_CE, (ys, p))
 
     def activation(self, activation):
 
@@ -181,20 +437,268 @@ class Scalar:
         else:
             raise Exception(f'Activation {activation} not in {available}')
 
-    def backward(self):
+    def backward(self, topo=None, retain_graph=False, hook=None):
+        '''
+        Backpropagate from this node. The graph is released as it goes,
+        unless retain_graph - which a second backward through it, or
+        reusing topo, needs. hook is passed on to backprop.
+        '''
+        # pass the order from a previous build_topo(self) to skip the rebuild;
+        # build_topo checks for released nodes as it goes, a passed order is
+        # checked here
+        if topo is None:
+            topo = build_topo(self)
+        else:
+            for node in topo:
+                check_retained(node)
 
-        topo = []
-        visited = set()
+        # a retained graph's interior nodes still hold the previous pass's gradients
+        for node in topo:
+            if node._op:
+                node.grad = 0.0
 
-        def build_topo(v):
-            if v not in visited:
-                visited.add(v)
-                for child in v._prev:
-                    build_topo(child)
-                topo.append(v)
+        self.grad = np.ones_like(self.data) if isinstance(self, Tensor) else 1.0
+        backprop(topo, release=not retain_graph, hook=hook)
 
-        build_topo(self)
 
-        self.grad = 1.0
-        for node in reversed(topo):
-            node._backward()
+def _unbroadcast(grad, shape):
+    # Sum a broadcast gradient back down to the shape of the operand
+    while grad.ndim > len(shape):
+        grad = grad.sum(axis=0)
+    for axis, size in enumerate(shape):
+        if size == 1 and grad.shape[axis] != 1:
+            grad = grad.sum(axis=axis, keepdims=True)
+    return grad
+
+
+def _tensor_add_backward(y):
+    # Chain Rule: dL/da = dL/dy (summed over broadcast axes)
+    a, b = y._prev
+    a.grad += _unbroadcast(y.grad, a.shape)
+    b.grad += _unbroadcast(y.grad, b.shape)
+
+
+def _tensor_mul_backward(y):
+    # Chain Rule: dL/da = dL/dy * b (summed over broadcast axes)
+    a, b = y._prev
+    a.grad += _unbroadcast(y.grad * b.data, a.shape)
+    b.grad += _unbroadcast(y.grad * a.data, b.shape)
+
+
+def _tensor_matmul_backward(y):
+    # Derivative: dy/da = b.T, dy/db = a.T
+    # Chain Rule: dL/da = dL/dy @ b.T
+    #             dL/db = a.T @ dL/dy
+    a, b = y._prev
+
+    # promote 1-D operands to matrices so both cases share one rule
+    _a, _b, _g = a.data, b.data, y.grad
+    if _a.ndim == 1:
+        _a, _g = _a[np.newaxis, :], _g[np.newaxis, ...]
+    if _b.ndim == 1:
+        _b, _g = _b[:, np.newaxis], _g[..., np.newaxis]
+    a.grad += (_g @ _b.T).reshape(a.shape)
+    b.grad += (_a.T @ _g).reshape(b.shape)
+
+
+def _tensor_sum_backward(y):
+    # Derivative: dy/da = 1
+    # Chain Rule: dL/da = dL/dy (broadcast back over the summed axes)
+    a, = y._prev
+    axis, keepdims = y._arg
+    _g = y.grad
+    if axis is not None and not keepdims:
+        _g = np.expand_dims(_g, axis)
+    a.grad += np.broadcast_to(_g, a.shape)
+
+
+def _tensor_softmax_ce_backward(y):
+    # Chain Rule: dL/dz = dL/dy * (p - y) / N
+    a, = y._prev
+    ys, p, pred_length = y._arg
+    a.grad += y.grad * _softmax_crossentropy_grad(p, ys) / pred_length
+
+
+_TENSOR_BACKWARD = {
+    ADD: _tensor_add_backward,
+    MUL: _tensor_mul_backward,
+    POW: _pow_backward,
+    EXP: _exp_backward,
+    LOG: _log_backward,
+    ACT: _act_backward,
+    MATMUL: _tensor_matmul_backward,
+    SUM: _tensor_sum_backward,
+    STOP: _stop_backward,
+    SOFTMAX_CE: _tensor_softmax_ce_backward,
+}
+
+
+def _tensor_exp_forward(y):
+    a, = y._prev
+    y.data = np.exp(a.data)
+
+
+def _tensor_log_forward(y):
+    a, = y._prev
+    y.data = np.log(a.data + 1e-8)
+
+
+def _tensor_matmul_forward(y):
+    a, b = y._prev
+    y.data = a.data @ b.data
+
+
+def _tensor_sum_forward(y):
+    a, = y._prev
+    axis, keepdims = y._arg
+    y.data = a.data.sum(axis=axis, keepdims=keepdims)
+
+
+def _tensor_softmax_ce_forward(y):
+    a, = y._prev
+    ys, _, pred_length = y._arg
+    nll, p = _softmax_crossentropy(a.data, ys)
+    y.data = np.asarray(nll.sum() / pred_length)
+    y._arg = (ys, p, pred_length)
+
+
+_TENSOR_FORWARD = {
+    ADD: _add_forward,
+    MUL: _mul_forward,
+    POW: _pow_forward,
+    EXP: _tensor_exp_forward,
+    LOG: _tensor_log_forward,
+    ACT: _act_forward,
+    MATMUL: _tensor_matmul_forward,
+    SUM: _tensor_sum_forward,
+    STOP: _stop_forward,
+    SOFTMAX_CE: _tensor_softmax_ce_forward,
+}
+
+
+class Tensor:
+
+    __slots__ = ('data', 'grad', '_prev', '_op', '_arg')
+
+    # make ndarray <op> Tensor defer to the Tensor's reflected operator
+    __array_ufunc__ = None
+
+    def __init__(self, data, _in=(), _op=LEAF, _arg=None):
+        self.data = np.asarray(data, dtype=np.float64)
+
+        if _grad_enabled:
+            self.grad = np.zeros_like(self.data)
+            self._prev = _in
+            self._op = _op
+            self._arg = _arg
+        else:
+            self.grad = 0.0
+            self._prev = ()
+            self._op = LEAF
+            self._arg = None
+
+    def __repr__(self):
+        return f'Tensor(data={self.data}, shape={self.shape})'
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def __add__(a, b):
+        b = b if isinstance(b, Tensor) else Tensor(b)
+
+        # Calculation: y = a + b
+        return Tensor(a.data + b.data, (a, b), ADD)
+
+    def __radd__(a, b):
+        # b + a = a + b
+        return a.__add__(b)
+
+    def __mul__(a, b):
+        b = b if isinstance(b, Tensor) else Tensor(b)
+
+        # Calculation: y = a * b
+        return Tensor(a.data * b.data, (a, b), MUL)
+
+    def __rmul__(a, b):
+        # b * a = a * b
+        return a.__mul__(b)
+
+    def __neg__(a):
+        # -a = a * -1
+        return a.__mul__(-1)
+
+    def __sub__(a, b):
+        # a - b = a + (b * -1)
+        return a.__add__(-b)
+
+    def __rsub__(a, b):
+        # b - a = (a * -1) + b
+        return (a.__neg__()).__add__(b)
+
+    def __pow__(a, b):
+
+        assert isinstance(b, (int, float)), "Exponent is not int/float"
+
+        # Calculation: y = a ** b
+        return Tensor((a.data + 1e-8) ** b, (a, ), POW, b)  # don't divide by 0 :)
+
+    def __truediv__(a, b):
+        # a / b = a * (b ** -1)
+        return a.__mul__((b + 1e-8).__pow__(-1))
+
+    def __rtruediv__(a, b):
+        # b / a = (a ** -1) * b
+        return ((a + 1e-8).__pow__(-1)).__mul__(b)
+
+    def __matmul__(a, b):
+        b = b if isinstance(b, Tensor) else Tensor(b)
+
+        assert a.data.ndim <= 2 and b.data.ndim <= 2, "matmul supports 1-D and 2-D operands"
+
+        # Calculation: y = a @ b
+        return Tensor(a.data @ b.data, (a, b), MATMUL)
+
+    def __rmatmul__(a, b):
+        # b @ a
+        return Tensor(b).__matmul__(a)
+
+    def exp(a):
+        # Calculation: y = e ** a
+        return Tensor(np.exp(a.data), (a, ), EXP)
+
+    def log(a):
+        # Calculation: y = ln(a)
+        return Tensor(np.log(a.data + 1e-8), (a, ), LOG)
+
+    def stop_gradient(a):
+        # Calculation: y = a, but no gradient flows back into a
+        return Tensor(a.data, (a, ), STOP)
+
+    def sum(a, axis=None, keepdims=False):
+        # Calculation: y = Σ a
+        return Tensor(a.data.sum(axis=axis, keepdims=keepdims), (a, ), SUM, (axis, keepdims))
+
+    def softmax_crossentropy(a, ys):
+        '''
+        Mean cross entropy of the row-wise softmax of these logits, fused
+        into a single node. ys holds a class index per row or a one-hot
+        (or probability) row per row.
+        '''
+        ys = np.asarray(ys)
+        if ys.shape == a.shape:
+            ys = ys.astype(np.float64)
+        else:
+            ys = ys.reshape(a.shape[:-1]).astype(np.intp)
+        pred_length = len(a.data) if a.data.ndim > 1 else 1
+
+        # Calculation: y = -1/N Σ_i Σ_j y_ij * log(softmax(z_i)_j)
+        nll, p = _softmax_crossentropy(a.data, ys)
+        return Tensor(nll.sum() / pred_length, (a, ), SOFTMAX_CE, (ys, p, pred_length))
+
+    # activations dispatch on the node type, so the Scalar lookup applies as-is
+    activation = Scalar.activation
+
+    # as does backward, which seeds the gradient to match the node
+    backward = Scalar.backward
+
@@ -0,0 +1,220 @@
+import mmap
+import os
+import queue
+import threading
+
+import numpy as np
+
+__all__ = ['DataLoader', 'MemmapDataset', 'NpyFile', 'batches', 'is_stream']
+
+
+def is_stream(x):
+    # lists, tuples and arrays hold the records themselves - anything
+    # else iterable hands over one batch at a time
+    return not isinstance(x, (list, tuple, np.ndarray)) and hasattr(x, '__iter__')
+
+
+def batches(x, y=None, batch_size=32, shuffle=False, rng=None):
+    '''
+    Yield (x_batch, y_batch) pairs - or x_batches when y is None - from
+    in-memory records, in order or in a random permutation drawn from
+    rng, a numpy Generator.
+    '''
+    x = np.asarray(x)
+    y = np.asarray(y) if y is not None else None
+    rng = rng if rng is not None else np.random.default_rng()
+    order = rng.permutation(len(x)) if shuffle else np.arange(len(x))
+    for i in range(0, len(x), batch_size):
+        batch = order[i:i + batch_size]
+        yield (x[batch], y[batch]) if y is not None else x[batch]
+
+
+class DataLoader:
+    '''
+    Iterate a source of batches on a background thread, running transform
+    on each, while the consumer works on the current one. At most prefetch
+    batches wait in the queue, so a fast source never runs far ahead.
+
+    source is an iterable of batches - (x_batch, y_batch) pairs or bare
+    x_batches - or a function returning one, called again every epoch so
+    a generator function can be iterated more than once.
+    '''
+
+    def __init__(self, source, prefetch=2, transform=None):
+        if prefetch < 1:
+            raise Exception('[Invalid Prefetch] - prefetch must be at least 1')
+
+        self.source = source
+        self.prefetch = prefetch
+        self.transform = transform
+
+    def __len__(self):
+        return len(self.source)
+
+    def __iter__(self):
+        source = self.source() if callable(self.source) else self.source
+
+        buffer = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+
+        def put(item):
+            # give up once the consumer has gone away, instead of blocking on a full queue
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce():
+            try:
+                for batch in source:
+                    if self.transform is not None:
+                        batch = self.transform(batch)
+                    if not put((True, batch)):
+                        return
+                put((False, None))
+            except BaseException as error:
+                put((False, error))
+
+        thread = threading.Thread(target=produce, daemon=True)
+        thread.start()
+        try:
+            while True:
+                more, batch = buffer.get()
+                if not more:
+                    # the producer's exception surfaces in the consumer
+                    if batch is not None:
+                        raise batch
+                    return
+                yield batch
+        finally:
+            stop.set()
+            thread.join()
+
+    def __repr__(self):
+        return f'DataLoader(prefetch={self.prefetch})'
+
+
+class NpyFile:
+    '''
+    A .npy file mapped read-only. array reads pages from disk as they are
+    touched; rows() reads chosen records with one pread each instead, so
+    scattered reads map nothing - the page cache may map a large folio
+    around every record touched through the map.
+    '''
+
+    def __init__(self, path):
+        # np.load parses the header; the map is opened here so it can be advised
+        header = np.load(path, mmap_mode='r')
+        self.offset = header.offset
+        self.file = open(path, 'rb')
+        # mmap cannot map an empty file
+        size = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+        order = 'F' if header.flags.f_contiguous and not header.flags.c_contiguous else 'C'
+        self.array = np.ndarray(header.shape, dtype=header.dtype, buffer=self.map, offset=self.offset, order=order)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.array)
+
+    def close(self):
+        '''
+        Close the file and unmap it. A view handed out earlier keeps the
+        map open until the last one is gone, then it is unmapped.
+        '''
+        # closing the map outright would leave those views reading freed
+        # memory, so only the references here are dropped - the map is
+        # unmapped with its last reference
+        self.array = None
+        self.map = b''
+        self.file.close()
+
+    def rows(self, index):
+        if not self.array.flags.c_contiguous:
+            return self.array[index]
+
+        out = np.empty((len(index), ) + self.array.shape[1:], dtype=self.array.dtype)
+        stride = self.array.strides[0]
+        for row, i in zip(out.reshape(len(index), -1), index):
+            os.preadv(self.file.fileno(), [row], self.offset + int(i) * stride)
+        return out
+
+    def release(self):
+        '''
+        Unmap every resident page; later reads fault them back in from
+        the page cache, so views handed out earlier stay valid.
+        '''
+        if isinstance(self.map, mmap.mmap) and hasattr(mmap, 'MADV_DONTNEED'):
+            self.map.madvise(mmap.MADV_DONTNEED)
+
+
+class MemmapDataset:
+    '''
+    Records in .npy files on disk, read as a stream of (x_batch, y_batch)
+    pairs - bare x_batches when there is no y - for fit, evaluate and
+    predict. Batches in order are zero-copy slices of a memory map;
+    shuffled batches gather their rows through a permutation of the record
+    indices, so the records themselves are never reordered.
+
+    Once the consumer moves on, the pages a batch touched are dropped from
+    the process - they stay in the page cache - so resident memory follows
+    the batch size rather than the size of the files. Close the dataset,
+    or use it in a with block, to close the files.
+    '''
+
+    def __init__(self, x, y=None, batch_size=32, shuffle=False, seed=None):
+        self.x = NpyFile(x)
+        self.y = NpyFile(y) if y is not None else None
+
+        if self.y is not None and len(self.y) != len(self.x):
+            raise Exception(f'[Length Mismatch] - x holds {len(self.x)} records but y holds {len(self.y)}')
+
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        # permutations come from the dataset's own generator - the same
+        # seed reads the records in the same orders
+        self.rng = np.random.default_rng(seed)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return -(-len(self.x) // self.batch_size)
+
+    def close(self):
+        for f in (self.x, self.y):
+            if f is not None:
+                f.close()
+
+    def __iter__(self):
+        files = (self.x, self.y) if self.y is not None else (self.x, )
+        n = len(self.x)
+
+        if self.shuffle:
+            order = self.rng.permutation(n)
+            for i in range(0, n, self.batch_size):
+                # sorted, so each batch reads the file front to back
+                batch = np.sort(order[i:i + self.batch_size])
+                out = tuple(f.rows(batch) for f in files)
+                yield out if self.y is not None else out[0]
+        else:
+            for i in range(0, n, self.batch_size):
+                out = tuple(f.array[i:i + self.batch_size] for f in files)
+                yield out if self.y is not None else out[0]
+                for f in files:
+                    f.release()
+
+    def __repr__(self):
+        return f'MemmapDataset(records={len(self.x)}, batch_size={self.batch_size}, shuffle={self.shuffle})'
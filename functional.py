@@ -1,4 +1,6 @@
 import math
+
+import numpy as np
 import kaitorch.activations as A
 
 activations = A.__all__
@@ -6,16 +8,27 @@ derivatives = [f'd_{activation}' for activation in activations]
 
 __all__ = [x for y in zip(activations, derivatives) for x in y]
 
+# Every function takes a float or an ndarray and works elementwise; a float
+# in gives a float out. Python numbers - one Scalar's value - take a math
+# path in the same stable form, as numpy's per-call overhead would dwarf
+# the work; anything else goes through numpy (the [()] below unwraps 0-d
+# results). The check is on the exact type, the cheapest test there is.
+
+NUMBER = frozenset((float, int))
+
 
 def sigmoid(x):
     '''
     Calculation: y = 1 / (1 + (e ** -x))
     '''
-    if x < 0:
-        out = math.exp(x) / (1 + math.exp(x))
-    else:
-        out = 1 / (1 + math.exp(-x))
-    return out
+    if type(x) in NUMBER:
+        z = math.exp(-abs(x))
+        return z / (1 + z) if x < 0 else 1 / (1 + z)
+    x = np.asarray(x, dtype=np.float64)
+    # e ** -|x| never overflows, and picks the stable form for either sign
+    z = np.exp(-np.abs(x))
+    out = np.where(x < 0, z / (1 + z), 1 / (1 + z))
+    return out[()]
 
 
 def d_sigmoid(x):
@@ -24,7 +37,8 @@ def d_sigmoid(x):
     Chain Rule: dL/dx = dL/dy * dy/dx
                       = dL/dy * (sigmoid(x) * (1 - sigmoid(x)))
     '''
-    out = sigmoid(x) * (1 - sigmoid(x))
+    s = sigmoid(x)
+    out = s * (1 - s)
     return out
 
 
@@ -32,8 +46,11 @@ def tanh(x):
     '''
     Calculation: y = (e ** (2 * x) - 1) / (e ** (2 * x) + 1)
     '''
-    out = (math.exp(2 * x) - 1) / (math.exp(2 * x) + 1)
-    return out
+    # tanh saturates to ±1 instead of overflowing e ** (2 * x)
+    if type(x) in NUMBER:
+        return math.tanh(x)
+    out = np.tanh(np.asarray(x, dtype=np.float64))
+    return out[()]
 
 
 def d_tanh(x):
@@ -51,8 +68,11 @@ def ReLU(x):
     Calculation: y = x if x ≥ 0
                      0 if x < 0
     '''
-    out = 0 if x < 0 else x
-    return out
+    if type(x) in NUMBER:
+        return 0.0 if x < 0 else x
+    x = np.asarray(x, dtype=np.float64)
+    out = np.where(x < 0, 0.0, x)
+    return out[()]
 
 
 def d_ReLU(x):
@@ -63,8 +83,10 @@ def d_ReLU(x):
                       = dL/dy * 1 if x ≥ 0
                         dL/dy * 0 if x < 0
     '''
-    out = (x > 0) * 1
-    return out
+    if type(x) in NUMBER:
+        return 1.0 if x > 0 else 0.0
+    out = (np.asarray(x) > 0) * 1.0
+    return out[()]
 
 
 def LeakyReLU(x, alpha=0.1):
@@ -72,8 +94,11 @@ def LeakyReLU(x, alpha=0.1):
     Calculation: y = x if x ≥ 0
                      x * α if x < 0
     '''
-    out = x * alpha if x < 0 else x
-    return out
+    if type(x) in NUMBER:
+        return x * alpha if x < 0 else x
+    x = np.asarray(x, dtype=np.float64)
+    out = np.where(x < 0, x * alpha, x)
+    return out[()]
 
 
 def d_LeakyReLU(x, alpha=0.1):
@@ -84,8 +109,10 @@ def d_LeakyReLU(x, alpha=0.1):
                       = dL/dy * 1 if x ≥ 0
                         dL/dy * α if x < 0
     '''
-    out = alpha if x < 0 else 1
-    return out
+    if type(x) in NUMBER:
+        return float(alpha) if x < 0 else 1.0
+    out = np.where(np.asarray(x) < 0, float(alpha), 1.0)
+    return out[()]
 
 
 def ELU(x, alpha=1.0):
@@ -94,8 +121,12 @@ def ELU(x, alpha=1.0):
     Calculation: y = x if x ≥ 0
                      α * ((e ** x) - 1) if x < 0
     '''
-    out = alpha * (math.exp(x) - 1) if x < 0 else x
-    return out
+    if type(x) in NUMBER:
+        return alpha * math.expm1(x) if x < 0 else x
+    x = np.asarray(x, dtype=np.float64)
+    # clip before exp so the unused branch cannot overflow for large x
+    out = np.where(x < 0, alpha * np.expm1(np.minimum(x, 0)), x)
+    return out[()]
 
 
 def d_ELU(x, alpha=1.0):
@@ -106,16 +137,22 @@ def d_ELU(x, alpha=1.0):
                       = dL/dy * 1 if x ≥ 0
                         dL/dy * α * (e ** x) if x < 0
     '''
-    out = (alpha * math.exp(x)) if x < 0 else 1
-    return out
+    if type(x) in NUMBER:
+        return alpha * math.exp(x) if x < 0 else 1.0
+    x = np.asarray(x, dtype=np.float64)
+    out = np.where(x < 0, alpha * np.exp(np.minimum(x, 0)), 1.0)
+    return out[()]
 
 
 def swish(x, beta=1.0):
     '''
     Calculation: y = x * sigmoid(β * x)
     '''
+    if type(x) in NUMBER:
+        return x * sigmoid(x * beta)
+    x = np.asarray(x, dtype=np.float64)
     out = x * sigmoid(x * beta)
-    return out
+    return out[()]
 
 
 def d_swish(x, beta=1.0):
@@ -125,5 +162,7 @@ def d_swish(x, beta=1.0):
                       = dL/dy * swish(x, β) + sigmoid(β * x) * (1 - swish(x, β))
     '''
 
+    if not type(x) in NUMBER:
+        x = np.asarray(x)
     out = swish(x, beta) + sigmoid(beta * x) * (1 - swish(x, beta))
     return out
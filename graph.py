@@ -1,21 +1,26 @@
+from collections import Counter
+
 from graphviz import Digraph
 
-import kaitorch.activations as A
-from kaitorch.core import Scalar
+from kaitorch.core import ADD, Tensor, build_topo, op_label
+
+__all__ = ['trace', 'plot_model', 'write_dot', 'summarize_layers', 'plot_layers']
 
 
 def trace(root):
-    nodes, edges = set(), set()
+    '''
+    Every node and edge reachable from root. Walks with an explicit stack,
+    so graph depth is not bound by the recursion limit.
+    '''
+    nodes = set(build_topo(root))
+    edges = {(child, v) for v in nodes for child in v._prev}
+    return nodes, edges
 
-    def build(v):
-        if v not in nodes:
-            nodes.add(v)
-            for child in v._prev:
-                edges.add((child, v))
-                build(child)
 
-    build(root)
-    return nodes, edges
+def node_label(n):
+    if isinstance(n, Tensor):
+        return "{shape %s}" % (n.shape, )
+    return "{data %.4f | grad %.4f}" % (n.data, n.grad)
 
 
 def plot_model(root, filename=None):
@@ -37,15 +42,122 @@ def plot_model(root, filename=None):
     for n in all_nodes:
         uid = str(id(n))
 
-        dot.node(name=uid,
-                 label="{data %.4f | grad %.4f}" % (n.data, n.grad),
-                 shape='record')
-        if n._op:
-            dot.node(name=uid+n._op, label=n._op)
-            dot.edge(uid+n._op, uid)
+        dot.node(name=uid, label=node_label(n), shape='record')
+        op = op_label(n)
+        if op:
+            dot.node(name=uid+op, label=op)
+            dot.edge(uid+op, uid)
 
     for n1, n2 in all_edges:
-        dot.edge(str(id(n1)), str(id(n2)) + n2._op)
+        dot.edge(str(id(n1)), str(id(n2)) + op_label(n2))
+
+    if filename:
+        dot.render(filename=filename, view=True)
+    return dot
+
+
+def write_dot(root, f):
+    '''
+    Write the graph under root as DOT source to f, a path or an open text
+    file, one node at a time as the walk reaches it - the same drawing as
+    plot_model, without building it in memory first. Only the ids of
+    visited nodes are kept, to draw shared nodes once. Returns the number
+    of nodes.
+    '''
+    if isinstance(f, str):
+        with open(f, 'w') as file:
+            return write_dot(root, file)
+
+    f.write('digraph {\n\trankdir=TB\n')
+
+    visited = {id(root)}
+    stack = [root]
+    while stack:
+        n = stack.pop()
+        uid = str(id(n))
+
+        f.write(f'\t{uid} [label="{node_label(n)}" shape=record]\n')
+        op = op_label(n)
+        if op:
+            f.write(f'\t"{uid}{op}" [label="{op}"]\n')
+            f.write(f'\t"{uid}{op}" -> {uid}\n')
+
+        # x * x lists x twice, but is drawn with one edge
+        for child in dict.fromkeys(n._prev):
+            f.write(f'\t{id(child)} -> "{uid}{op}"\n')
+            if id(child) not in visited:
+                visited.add(id(child))
+                stack.append(child)
+
+    f.write('}\n')
+    return len(visited)
+
+
+def summarize_layers(model):
+    '''
+    One summary per layer of a built Sequential, with a Dense layer's
+    activation as a step of its own: input and output shapes, parameters,
+    and the graph ops one forward pass creates, by type.
+    '''
+    from kaitorch.tape import Tape
+
+    # a one-record forward, recorded with each layer's ops kept together
+    tape = Tape(model)
+
+    summaries = []
+    seen = {tape.input}
+    shape = tape.input.shape
+    for layer, lo, hi in tape.layers:
+        ops = tape.topo[lo:hi]
+        name = type(layer).__name__
+        params = sum(p.data.size for p in layer.parameters())
+
+        # the Dense op ends at x @ w + b - everything after is its activation
+        pre = [n for n in ops if n._op == ADD and any(p is layer.b for p in n._prev)] if name == 'Dense' else []
+        if pre:
+            dense = [n for n in build_topo(pre[0], stop=seen) if n._op]
+            steps = [(name, dense, params, pre[0].shape)]
+            dense = set(dense)
+            activation = [n for n in ops if n not in dense]
+            if activation:
+                steps.append((str(layer.activation), activation, 0, activation[-1].shape))
+        else:
+            steps = [(name, ops, params, ops[-1].shape if ops else shape)]
+
+        for step, step_ops, step_params, out_shape in steps:
+            summaries.append({
+                'name': step,
+                'layer': repr(layer),
+                'input_shape': (None, ) + tuple(shape[1:]),
+                'output_shape': (None, ) + tuple(out_shape[1:]),
+                'params': int(step_params),
+                'ops': dict(Counter(op_label(n) for n in step_ops)),
+            })
+            shape = out_shape
+        seen.update(ops)
+
+    return summaries
+
+
+def plot_layers(model, filename=None):
+    '''
+    The model drawn with one node per layer - Dense, its activation,
+    Dropout - instead of one per graph node.
+    '''
+    dot = Digraph(format='png', graph_attr={'rankdir': 'TB'})
+
+    previous = 'input'
+    dot.node(name=previous, label="{input | (None, %d)}" % model.layer_sizes[0], shape='record')
+    for i, summary in enumerate(summarize_layers(model)):
+        uid = f'layer{i}'
+        ops = ', '.join(f'{op} x{count}' for op, count in summary['ops'].items()) or 'none'
+        label = "{%s | %s → %s | params %d | ops %d: %s}" % (
+            summary['name'], summary['input_shape'], summary['output_shape'],
+            summary['params'], sum(summary['ops'].values()), ops,
+        )
+        dot.node(name=uid, label=label, shape='record')
+        dot.edge(previous, uid)
+        previous = uid
 
     if filename:
         dot.render(filename=filename, view=True)
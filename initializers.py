@@ -1,5 +1,6 @@
 import math
-import random
+
+import numpy as np
 
 __all__ = [
     'glorot_uniform',
@@ -46,7 +47,35 @@ def random_normal():
 
 
 class Initializer:
-    pass
+    '''
+    Draws the starting weights of a layer with nin inputs and nout units.
+    sample fills a whole array from a generator in one call; a subclass
+    that only defines __call__(nin, nout), returning one float, is called
+    once per weight instead - as is a subclass that overrides __call__ on
+    one of the initializers here.
+    '''
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # an overridden __call__ draws the weights, not an inherited sample
+        if '__call__' in vars(cls) and 'sample' not in vars(cls):
+            cls.sample = Initializer.sample
+
+    def sample(self, rng, nin, nout, shape):
+        if type(self).__call__ is Initializer.__call__:
+            raise Exception(f'[Undefined Initializer] - {type(self).__name__} defines neither sample nor __call__')
+        count = int(np.prod(shape))
+        return np.reshape([self(nin, nout) for _ in range(count)], shape)
+
+    def __call__(self, nin, nout):
+        # one weight, for callers of the per-weight interface - drawn by the
+        # nearest sample that fills arrays, so an override calling super()
+        # does not come back to itself
+        for cls in type(self).__mro__:
+            sample = vars(cls).get('sample')
+            if sample is not None and sample is not Initializer.sample:
+                return float(sample(self, np.random.default_rng(), nin, nout, ()))
+        raise Exception(f'[Undefined Initializer] - {type(self).__name__} defines no sample to draw from')
 
 
 class GlorotUniform(Initializer):
@@ -54,13 +83,9 @@ class GlorotUniform(Initializer):
     def __init__(self):
         pass
 
-    def __call__(self, nin, nout):
-
-        glorot_uniform_sample = random.uniform(
-            a=-math.sqrt(6 / (nin + nout)),
-            b=math.sqrt(6 / (nin + nout))
-        )
-        return glorot_uniform_sample
+    def sample(self, rng, nin, nout, shape):
+        limit = math.sqrt(6 / (nin + nout))
+        return rng.uniform(-limit, limit, size=shape)
 
     def __repr__(self):
         return 'glorot_uniform'
@@ -71,13 +96,8 @@ class GlorotNormal(Initializer):
     def __init__(self):
         pass
 
-    def __call__(self, nin, nout):
-
-        glorot_normal_sample = random.gauss(
-            mu=0,
-            sigma=math.sqrt(2 / (nin + nout))
-        )
-        return glorot_normal_sample
+    def sample(self, rng, nin, nout, shape):
+        return rng.normal(0, math.sqrt(2 / (nin + nout)), size=shape)
 
     def __repr__(self):
         return 'glorot_normal'
@@ -88,13 +108,9 @@ class HeUniform(Initializer):
     def __init__(self):
         pass
 
-    def __call__(self, nin, nout):
-
-        he_uniform_sample = random.uniform(
-            a=-math.sqrt(6 / nin),
-            b=math.sqrt(6 / nin)
-        )
-        return he_uniform_sample
+    def sample(self, rng, nin, nout, shape):
+        limit = math.sqrt(6 / nin)
+        return rng.uniform(-limit, limit, size=shape)
 
     def __repr__(self):
         return 'he_uniform'
@@ -105,13 +121,8 @@ class HeNormal(Initializer):
     def __init__(self):
         pass
 
-    def __call__(self, nin, *args, **kwargs):
-
-        he_normal_sample = random.gauss(
-            mu=0,
-            sigma=math.sqrt(2 / nin)
-        )
-        return he_normal_sample
+    def sample(self, rng, nin, nout, shape):
+        return rng.normal(0, math.sqrt(2 / nin), size=shape)
 
     def __repr__(self):
         return 'he_normal'
@@ -122,13 +133,9 @@ class LecunUniform(Initializer):
     def __init__(self):
         pass
 
-    def __call__(self, nin, nout):
-
-        lecun_uniform_sample = random.uniform(
-            a=-math.sqrt(3 / nin),
-            b=math.sqrt(3 / nin)
-        )
-        return lecun_uniform_sample
+    def sample(self, rng, nin, nout, shape):
+        limit = math.sqrt(3 / nin)
+        return rng.uniform(-limit, limit, size=shape)
 
     def __repr__(self):
         return 'lecun_uniform'
@@ -139,13 +146,8 @@ class LecunNormal(Initializer):
     def __init__(self):
         pass
 
-    def __call__(self, nin, *args, **kwargs):
-
-        lecun_normal_sample = random.gauss(
-            mu=0,
-            sigma=math.sqrt(1 / nin)
-        )
-        return lecun_normal_sample
+    def sample(self, rng, nin, nout, shape):
+        return rng.normal(0, math.sqrt(1 / nin), size=shape)
 
     def __repr__(self):
         return 'lecun_normal'
@@ -156,13 +158,8 @@ class RandomUniform(Initializer):
     def __init__(self):
         pass
 
-    def __call__(self, nin, nout):
-
-        random_uniform_sample = random.uniform(
-            a=-0.05,
-            b=0.05
-        )
-        return random_uniform_sample
+    def sample(self, rng, nin, nout, shape):
+        return rng.uniform(-0.05, 0.05, size=shape)
 
     def __repr__(self):
         return 'random_uniform'
@@ -173,13 +170,8 @@ class RandomNormal(Initializer):
     def __init__(self):
         pass
 
-    def __call__(self, nin, *args, **kwargs):
-
-        random_normal_sample = random.gauss(
-            mu=0,
-            sigma=0.05
-        )
-        return random_normal_sample
+    def sample(self, rng, nin, nout, shape):
+        return rng.normal(0, 0.05, size=shape)
 
     def __repr__(self):
         return 'random_normal'
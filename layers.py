@@ -1,6 +1,6 @@
-import random
-from kaitorch.utils import unwrap, wrap
-from kaitorch.core import Scalar, Module
+import numpy as np
+
+from kaitorch.core import Tensor, Module
 from kaitorch.initializers import Initializer
 from kaitorch import activations as A
 from kaitorch import initializers as I
@@ -8,28 +8,11 @@ from kaitorch import initializers as I
 
 class Dense(Module):
 
-    class Node:
-
-        def __init__(self, nin, nout, activation, initializer):
-
-            self.w = [Scalar(initializer(nin, nout)) for _ in range(nin)]
-            self.b = Scalar(initializer(nin, nout))
-            self.a = activation
-
-        def __call__(self, x):
-            x = wrap(x)
-            signal = sum((wi*xi for wi, xi in zip(self.w, x)), self.b)
-            if self.a and self.a != 'softmax':
-                signal = signal.activation(self.a)
-            return signal
-
-        def parameters(self):
-            return self.w + [self.b]
-
     def __init__(self, nouts, activation=None, initializer='glorot_uniform'):
         self.nins = None
         self.nouts = nouts
-        self.nodes = None
+        self.w = None
+        self.b = None
         self.activation = activation
         self.initializer = self.get_initializer(initializer)
 
@@ -57,60 +40,65 @@ class Dense(Module):
             repr_str += f', initializer={self.initializer}'
         return repr_str + ')'
 
-    def __build__(self, nins):
+    def __build__(self, nins, rng=None):
         self.nins = nins
-        self.nodes = [
-            self.Node(self.nins, self.nouts, self.activation, self.initializer)
-            for _ in range(self.nouts)
-        ]
+        rng = rng if rng is not None else np.random.default_rng()
+
+        # w[i, j] connects input i to unit j; biases come from the same initializer
+        self.w = Tensor(self.initializer.sample(rng, self.nins, self.nouts, (self.nins, self.nouts)))
+        self.b = Tensor(self.initializer.sample(rng, self.nins, self.nouts, (self.nouts, )))
 
     def __call__(self, x):
-        outs = [n(x) for n in self.nodes]
+        x = x if isinstance(x, Tensor) else Tensor(x)
+
+        # (batch, nins) @ (nins, nouts) + (nouts, ) -> (batch, nouts)
+        signal = x @ self.w + self.b
         if self.activation == 'softmax':
-            outs = getattr(A, self.activation)(outs)
-        return unwrap(outs)
+            signal = A.softmax(signal)
+        elif self.activation:
+            signal = signal.activation(self.activation)
+        return signal
 
     def parameters(self):
-        return [p for node in self.nodes for p in node.parameters()]
+        return [self.w, self.b]
 
 
 class Dropout(Module):
+    '''
+    Inverted dropout: in training each unit of each record is kept with
+    probability 1 - dropout_rate and scaled up to match, so evaluation
+    passes the signal through untouched. Masks come from the layer's own
+    generator - the same seed draws the same masks.
+    '''
 
-    class Node:
-
-        def __init__(self, dropout_rate: float):
-            self.p = 1 - dropout_rate
-
-        def __call__(self, x, train):
-            if train:
-                return x * (1/self.p) if random.random() <= self.p else 0
-            else:
-                return x
-
-        def parameters(self):
-            return []
-
-    def __init__(self, dropout_rate: float = 0.5):
+    def __init__(self, dropout_rate: float = 0.5, seed=None):
 
         self.nins = None
         self.nouts = None
-        self.nodes = None
         self.q = dropout_rate
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
 
         if self.q < 0 or self.q > 1:
             raise ValueError("p must be a probability")
 
     def __repr__(self):
+        if self.seed is not None:
+            return f'Dropout(dropout_rate={self.q}, seed={self.seed})'
         return f'Dropout(dropout_rate={self.q})'
 
     def __build__(self, nins):
         self.nins = nins
         self.nouts = nins
-        self.nodes = [self.Node(self.q) for _ in range(self.nins)]
 
     def __call__(self, x, train):
-        outs = [n(xi, train) for n, xi in zip(self.nodes, x)]
-        return unwrap(outs)
+        if not train:
+            return x
+
+        # the whole batch's mask in one draw, applied in one multiply
+        p = 1 - self.q
+        mask = (self.rng.random(x.shape) < p) * (1 / p) if p else np.zeros(x.shape)
+        return x * mask
 
     def parameters(self):
-        return [p for node in self.nodes for p in node.parameters()]
+        return []
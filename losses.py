@@ -1,7 +1,9 @@
+import numpy as np
+
 from kaitorch.utils import wrap
-from kaitorch.core import Scalar
+from kaitorch.core import Scalar, Tensor
 
-__all__ = ['mse', 'binary_crossentropy', 'categorical_crossentropy']
+__all__ = ['mse', 'binary_crossentropy', 'categorical_crossentropy', 'softmax_crossentropy']
 
 
 def mse():
@@ -16,6 +18,20 @@ def categorical_crossentropy():
     return CategoricalCrossentropy()
 
 
+def softmax_crossentropy():
+    return SoftmaxCrossentropy()
+
+
+def as_targets(ys, y_preds: Tensor):
+    '''
+    Targets as an array shaped like y_preds, and the number of records
+    the loss is averaged over.
+    '''
+    ys = np.asarray(ys, dtype=np.float64).reshape(y_preds.shape)
+    pred_length = len(ys) if ys.ndim > 1 else 1
+    return ys, pred_length
+
+
 class MeanSquaredError:
 
     def __init__(self):
@@ -23,6 +39,10 @@ class MeanSquaredError:
 
     def __call__(self, ys: list, y_preds: list):
 
+        if isinstance(y_preds, Tensor):
+            ys, pred_length = as_targets(ys, y_preds)
+            return ((ys - y_preds)**2).sum() / pred_length
+
         ys, y_preds = wrap(ys), wrap(y_preds)
 
         # for 1/N
@@ -48,6 +68,11 @@ class BinaryCrossentropy:
 
     def __call__(self, ys, y_preds):
 
+        if isinstance(y_preds, Tensor):
+            ys, pred_length = as_targets(ys, y_preds)
+            loss = -(ys * y_preds.log()) - (1 - ys) * (1 - y_preds).log()
+            return loss.sum() / pred_length
+
         loss = 0.0
         ys, y_preds = wrap(ys), wrap(y_preds)
 
@@ -81,6 +106,11 @@ class CategoricalCrossentropy:
 
     def __call__(self, ys, y_preds):
 
+        if isinstance(y_preds, Tensor):
+            ys, pred_length = as_targets(ys, y_preds)
+            loss = -(ys * y_preds.log()) - (1 - ys) * (1 - y_preds).log()
+            return loss.sum() / pred_length
+
         loss = 0.0
         if isinstance(ys[0], (int, float, Scalar)):
             ys, y_preds = [ys], [y_preds]
@@ -109,3 +139,35 @@ class CategoricalCrossentropy:
 
     def __repr__(self):
         return 'CategoricalCrossEntropy()'
+
+
+class SoftmaxCrossentropy:
+    '''
+    Softmax and categorical cross entropy in one node. Takes logits - the
+    output of a final Dense layer with no activation - and targets as
+    either integer class labels or one-hot rows.
+    '''
+
+    def __init__(self):
+        pass
+
+    def __call__(self, ys, y_preds):
+
+        if isinstance(y_preds, Tensor):
+            return y_preds.softmax_crossentropy(ys)
+
+        # a single sample of Scalar logits
+        if isinstance(y_preds[0], Scalar):
+            ys, y_preds = [ys], [y_preds]
+
+        # 1/N
+        pred_length = len(ys)
+
+        loss = sum(Scalar.softmax_crossentropy(zs, y) for y, zs in zip(ys, y_preds))
+
+        softmax_crossentropy_loss = loss / pred_length
+
+        return softmax_crossentropy_loss
+
+    def __repr__(self):
+        return 'SoftmaxCrossentropy()'
@@ -1,27 +1,46 @@
+import time
+
+import numpy as np
+
 import kaitorch
 
 from kaitorch import activations as A
+from kaitorch import checkpoint
+from kaitorch import core
 from kaitorch import functional as F
 
-from kaitorch.core import Module, Scalar
-from kaitorch.layers import Dropout
-from kaitorch.graph import plot_model
-from kaitorch.utils import ffill, unwrap, wrap
+from kaitorch.core import Module, Tensor, no_grad
+from kaitorch.data import is_stream
+from kaitorch.layers import Dense, Dropout
+from kaitorch.graph import plot_layers, plot_model
+from kaitorch.utils import RunningMean, as_batch, count_params, ffill, unwrap
 from kaitorch.optimizers import Optimizer
+from kaitorch.parallel import DataParallel, score
+from kaitorch.profiler import Profiler
+from kaitorch.tape import Tape
 
 from tqdm import tqdm
 
 
 class Sequential(Module):
 
-    def __init__(self, layers=None):
+    def __init__(self, layers=None, seed=None):
         self.built = False
         self.compiled = False
 
+        # every Dense layer's starting weights come from this generator
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
         self.layers = layers if layers else []
         self.layer_sizes = [layer.nouts for layer in self.layers] if self.layers else []
 
+        self.tape = None
+        self.profiler = None
+        self.scheduler = None
+
     def __call__(self, x, train):
+        x = x if isinstance(x, Tensor) else Tensor(x)
         for layer in self.layers:
             if isinstance(layer, Dropout):
                 x = layer(x, train)
@@ -46,7 +65,7 @@ class Sequential(Module):
         for layer_num, layer in enumerate(self.layers):
             l_name = layer.__repr__()
             l_output = f"(None, {layer.nouts})"
-            l_params = len(layer.parameters())
+            l_params = count_params(layer.parameters())
             l_w = l_params - layer.nouts if l_params > 0 else 0
             l_b = layer.nouts if l_params > 0 else 0
 
@@ -55,7 +74,7 @@ class Sequential(Module):
                 print("_" * 115)
         print("=" * 115)
         print(
-            f"Total Params: {sum([len(layer.parameters()) for layer in self.layers])}"
+            f"Total Params: {count_params(self.parameters())}"
         )
         print("_" * 115)
 
@@ -73,22 +92,70 @@ class Sequential(Module):
         self.layer_sizes = ffill(self.layer_sizes)
 
         for idx, layer in enumerate(self.layers):
-            layer.__build__(self.layer_sizes[idx])
+            if isinstance(layer, Dense):
+                layer.__build__(self.layer_sizes[idx], self.rng)
+            else:
+                layer.__build__(self.layer_sizes[idx])
 
         self.built = True
 
-    def plot(self):
-
+    def plot(self, collapse=True, filename=None):
+        '''
+        Draw the model one node per layer, or with collapse=False one node
+        per graph node of a one-record forward pass.
+        '''
         if not self.built:
             raise Exception(
                 '[Model Not Built] - Use Sequential.build(input_size) to build model'
             )
+        if collapse:
+            return plot_layers(self, filename)
         empty_input = self.__call__([0]*self.layer_sizes[0], train=False)
-        return plot_model(empty_input)
+        return plot_model(empty_input, filename)
+
+    def capture(self):
+        '''
+        Record one forward pass into a Tape that fit, evaluate and predict
+        replay instead of rebuilding the graph for every batch.
+        '''
+        if not core._grad_enabled:
+            raise Exception('[Capture Failed] - A tape cannot be recorded inside no_grad()')
+        if not self.built:
+            raise Exception(
+                '[Model Not Built] - Use Sequential.build(input_size) to build model'
+            )
+        self.tape = Tape(self)
+        return self.tape
+
+    def release(self):
+        self.tape = None
+
+    def profile(self, enabled=True):
+        '''
+        Attach a Profiler that times every following fit, evaluate and
+        predict, or detach it with enabled=False. Returns the profiler.
+        '''
+        self.profiler = Profiler() if enabled else None
+        return self.profiler
 
     def parameters(self):
         return [p for layer in self.layers for p in layer.parameters()]
 
+    def save(self, path):
+        '''
+        Write the architecture, weights and optimizer state to one binary
+        checkpoint file.
+        '''
+        checkpoint.save(self, path)
+
+    @classmethod
+    def load(cls, path, mmap_mode='c'):
+        '''
+        Rebuild a model from Sequential.save. Weights are memory-mapped
+        unless mmap_mode is None; see kaitorch.checkpoint.read.
+        '''
+        return checkpoint.load(path, mmap_mode)
+
     def compile(self, optimizer, loss):
 
         def set_optimizer(optimizer):
@@ -132,76 +199,227 @@ class Sequential(Module):
         if not self.compiled:
             raise Exception('[Missing Optimizer] - Model has not been compiled')
 
-        for p in self.parameters():
-            self.optimizer(p)
+        self.optimizer.step(self.parameters())
+        if self.scheduler is not None and self.scheduler.interval == 'step':
+            self.scheduler.step()
 
-    def run(self, x, y=None, epoch=1, epochs=1, train=False):
+    def run(self, x, y=None, epoch=1, epochs=1, train=False, batch_size=None, shuffle=False, pool=None, collect=False):
+
+        # Dropout draws a new mask per batch, which a tape cannot replay
+        dropout = any(isinstance(layer, Dropout) for layer in self.layers)
+        tape = self.tape if not (train and dropout) else None
 
         postfix_type = 'Train' if train is True else ''
 
+        # the profiler's timed versions of each batch's steps, or the plain calls
+        if self.profiler is not None:
+            forward, loss, backward, step = self.profiler.wrap(self, tape, train)
+        else:
+            forward = tape if tape is not None else lambda x: self.__call__(x, train=train)
+            loss = getattr(self, 'loss', None)
+            backward = tape.backward if tape is not None else lambda batch_loss: batch_loss.backward()
+            step = self.step
+
+        stream = is_stream(x)
+        if stream:
+            # a stream arrives already batched, and its length may be unknown
+            batches = x
+            try:
+                total = len(x)
+            except TypeError:
+                total = None
+        else:
+            # batches index into x and y - slices in order, or a permutation
+            # when shuffling - so the data itself is never copied as a whole
+            batch_size = batch_size or len(x)
+            if shuffle:
+                order = self.rng.permutation(len(x))
+                batches = [order[i:i + batch_size] for i in range(0, len(x), batch_size)]
+            else:
+                batches = [slice(i, i + batch_size) for i in range(0, len(x), batch_size)]
+            total = len(batches)
+
         tqdm_x = tqdm(
-            x,
+            batches,
+            total=total,
             ncols=160,
-            desc=f"Epoch {epoch:>3}/{epochs}", 
+            desc=f"Epoch {epoch:>3}/{epochs}",
             postfix='',
             bar_format='{l_bar}{bar:40}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}{postfix}]'
         )
 
         y_pred = []
 
-        for x_record in tqdm_x:
-            y_pred.append(self.__call__(x_record, train=train))
-            if y:
-                run_loss = self.loss(y[:len(y_pred)], y_pred)
-                tqdm_x.set_postfix_str(f"{postfix_type} Loss: {run_loss.data:.4f}")
+        # the loss graph is built once per batch, the display only needs its value
+        running_loss = RunningMean()
+
+        n_batches = 0
+        for batch in tqdm_x:
+            n_batches += 1
+
+            # the pool runs forward and backward in its workers, which read
+            # the batch's records themselves, leaving only the optimizer step
+            # to this process
+            if pool is not None:
+                size = len(range(len(x))[batch]) if isinstance(batch, slice) else len(batch)
+                running_loss.update(pool(batch), weight=size)
+                tqdm_x.set_postfix_str(f"{postfix_type} Loss: {running_loss.mean:.4f}")
+                step()
+                continue
+
+            if stream:
+                x_batch, y_batch = batch if isinstance(batch, tuple) else (batch, None)
+                x_batch = as_batch(x_batch)
+                y_batch = np.asarray(y_batch) if y_batch is not None else None
+                self.build(x_batch.shape[1])
+            else:
+                x_batch = x[batch]
+                y_batch = y[batch] if y is not None else None
+
+            batch_pred = forward(x_batch)
+
+            # kept only for predict, so evaluating a stream stays bounded in memory
+            if collect:
+                y_pred.append(batch_pred.data.copy())
+
+            if y_batch is not None:
+                batch_loss = loss(y_batch, batch_pred)
+                running_loss.update(batch_loss.data, weight=len(x_batch))
+                tqdm_x.set_postfix_str(f"{postfix_type} Loss: {running_loss.mean:.4f}")
             else:
-                run_loss = None
                 tqdm_x.set_postfix_str(f"{postfix_type}")
 
-        if train:
-            self.zero_grad()
-            run_loss.backward()
-            self.step()
+            # each batch's graph is built, backpropagated and dropped
+            if train:
+                if y_batch is None:
+                    raise Exception('[Missing Targets] - Training batches need targets')
+                self.zero_grad()
+                backward(batch_loss)
+                step()
+
+        if stream and not n_batches:
+            raise Exception('[Empty Stream] - No batches were read; a generator can only be iterated once')
+
+        y_pred = np.concatenate(y_pred) if y_pred else None
+        run_loss = running_loss.mean if running_loss.count else None
 
         return y_pred, run_loss
 
-    def fit(self, x, y, epochs=1):
+    def fit(self, x, y=None, epochs=1, batch_size=32, shuffle=True, workers=1, scheduler=None):
+        '''
+        x and y hold the records in memory - or x is an iterable of
+        (x_batch, y_batch) pairs, such as a DataLoader, read once per epoch.
+
+        A scheduler sets the optimizer's learning rate from then on,
+        advanced after every step or every epoch; it stays with the model
+        for later fits.
+        '''
+        if is_stream(x):
+            # workers index into the records, which a stream does not hold
+            if workers > 1:
+                raise Exception('[Unsupported Input] - workers need in-memory records, not a stream of batches')
+        else:
+            x, y = as_batch(x), np.asarray(y) if y is not None else None
+            self.build(x.shape[1])
+
+        if not self.compiled:
+            raise Exception('[Missing Optimizer] - Model has not been compiled')
 
-        x = wrap(x)
-        self.build(len(x[0]))
+        # kept only once attached, so a rejected scheduler does not stay on the model
+        scheduler = scheduler if scheduler is not None else self.scheduler
+        if scheduler is not None:
+            self.scheduler = scheduler.attach(self.optimizer)
 
         history = {'loss': []}
 
-        for epoch in range(1, epochs+1):
+        # with workers > 1 each batch is split across forked replicas
+        pool = DataParallel(self, x, y, workers) if workers > 1 else None
+
+        try:
+            for epoch in range(1, epochs+1):
+
+                y_pred, run_loss = self.run(
+                    x, y, epoch, epochs, train=True, batch_size=batch_size, shuffle=shuffle, pool=pool
+                )
+                history['loss'].append(run_loss)
 
-            y_pred, run_loss = self.run(x, y, epoch, epochs, train=True)
-            history['loss'].append(run_loss.data)
+                if self.scheduler is not None and self.scheduler.interval == 'epoch':
+                    self.scheduler.step(run_loss)
+        finally:
+            if pool is not None:
+                pool.close()
 
         return history
 
-    def evaluate(self, x, y):
+    def evaluate(self, x, y=None, batch_size=None):
 
-        x = wrap(x)
-        self.build(len(x[0]))
+        if not is_stream(x):
+            x, y = as_batch(x), np.asarray(y) if y is not None else None
+            self.build(x.shape[1])
 
         evaluation = {'loss': []}
 
-        y_pred, run_loss = self.run(x, y)
-        evaluation['loss'].append(run_loss.data)
+        with no_grad():
+            y_pred, run_loss = self.run(x, y, batch_size=batch_size)
+        evaluation['loss'].append(run_loss)
 
         return evaluation
 
-    def predict(self, x, as_scalar=False):
-
-        x = wrap(x)
-        self.build(len(x[0]))
-
-        y_pred, run_loss = self.run(x)
+    def predict(self, x, as_scalar=False, batch_size=1024, workers=1, chunk_size=None):
+        '''
+        Outputs for the records in x, in batches of batch_size - one batch
+        when None. With workers > 1 the batches go through in chunks of
+        whole batches across worker processes, and each record sees the
+        same batch as it would here, so the outputs match bit for bit.
+        '''
+        if workers > 1:
+            if is_stream(x):
+                raise Exception('[Unsupported Input] - workers need in-memory records, not a stream of batches')
+            x = as_batch(x)
+            self.build(x.shape[1])
+            y_pred = self.score(x, workers, chunk_size, batch_size)
+        else:
+            if not is_stream(x):
+                x = as_batch(x)
+                self.build(x.shape[1])
+            with no_grad():
+                y_pred, run_loss = self.run(x, batch_size=batch_size, collect=True)
 
         if as_scalar:
-            return [y for y in y_pred]
+            return Tensor(y_pred)
         else:
-            if isinstance(y_pred[0], Scalar):
-                return [y.data for y in y_pred]
-            elif isinstance(y_pred[0][0], Scalar):
-                return [[y.data for y in row] for row in y_pred]
+            # single-unit outputs come back as a flat list
+            if y_pred.shape[1] == 1:
+                return y_pred[:, 0].tolist()
+            return y_pred.tolist()
+
+    def score(self, x, workers, chunk_size=None, batch_size=None):
+        '''
+        Forward x in chunks across worker processes. Outputs match
+        run(x, batch_size=batch_size) exactly - or, with no batch_size,
+        run(x, batch_size=chunk_size) - as each record sees the same batch.
+        '''
+        if chunk_size is None:
+            # a few chunks per worker; the pool rounds it up to whole batches
+            chunk_size = -(-len(x) // (4 * workers))
+
+        tqdm_x = tqdm(
+            total=len(x),
+            ncols=160,
+            desc=f"Predict x{workers}",
+            unit='rows',
+            bar_format='{l_bar}{bar:40}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}{postfix}]'
+        )
+
+        # timed here, as a disabled bar reports no elapsed time
+        y_pred, rows, start = [], 0, time.perf_counter()
+        for chunk_pred in score(self, x, workers, chunk_size, batch_size):
+            y_pred.append(chunk_pred)
+            rows += len(chunk_pred)
+            elapsed = time.perf_counter() - start
+            tqdm_x.update(len(chunk_pred))
+            if elapsed > 0:
+                tqdm_x.set_postfix_str(f"{rows / elapsed:,.0f} rows/s")
+        tqdm_x.close()
+
+        return np.concatenate(y_pred)
@@ -1,11 +1,101 @@
-import math
+import numpy as np
 from kaitorch.core import Scalar
 
 __all__ = ['SGD', 'Momentum', 'Nesterov', 'Adagrad', 'RMSprop', 'Adam']
 
 
 class Optimizer:
-    pass
+
+    # names of the per-parameter moment buffers the update rule keeps,
+    # each a dict keyed by parameter
+    buffers = ()
+
+    def __call__(self, p: Scalar):
+        # a single parameter - learning rate decay is left to step()
+        self.update([p])
+
+    def step(self, params: list):
+        self.update(params)
+        self.lr *= self.decay_rate
+
+    def update(self, params: list):
+        '''
+        Apply the update rule once over the data, gradients and moment
+        buffers of every parameter, held in flat arrays. The arrays are
+        kept between steps - each Tensor's data and moment buffers are
+        views into them - so a step only copies the gradients in.
+        '''
+        flat = self._flatten(params)
+        data, grad, state = flat['data'], flat['grad'], flat['state']
+
+        for p, lo, hi in zip(params, flat['bounds'], flat['bounds'][1:]):
+            grad[lo:hi] = np.ravel(p.grad)
+            if isinstance(p, Scalar):
+                data[lo] = p.data
+
+        # rules update data and state in place; one returning new data
+        # instead still works
+        out = self.rule(data, grad, state)
+        if out is not None and out is not data:
+            data[:] = out
+
+        for p, lo in zip(params, flat['bounds']):
+            if isinstance(p, Scalar):
+                p.data = float(data[lo])
+
+    def _flatten(self, params):
+        # the flat arrays from the last step, while they still back these
+        # parameters - else gathered afresh from the parameters and buffers
+        flat = getattr(self, '_flat', None)
+        if flat is not None and len(flat['params']) == len(params) and all(
+            p is q and (view is None or p.data is view)
+            for p, q, view in zip(params, flat['params'], flat['views'])
+        ) and all(
+            getattr(self, name).get(p) is view
+            for name, views in flat['state_views'].items()
+            for p, view in zip(params, views)
+        ):
+            return flat
+
+        shapes = [np.shape(p.data) for p in params]
+        bounds = np.cumsum([0] + [int(np.prod(shape)) for shape in shapes])
+
+        def gather(values):
+            return np.concatenate([
+                np.broadcast_to(value, shape).ravel() for value, shape in zip(values, shapes)
+            ] or [np.empty(0)]).astype(np.float64)
+
+        def views(array):
+            return [array[lo:hi].reshape(shape) for shape, lo, hi in zip(shapes, bounds, bounds[1:])]
+
+        data = gather([p.data for p in params])
+        state = {name: gather([getattr(self, name).get(p, 0.0) for p in params]) for name in self.buffers}
+
+        # Tensors hold views into the flat data from here on; Scalars keep floats
+        data_views = [None if isinstance(p, Scalar) else view for p, view in zip(params, views(data))]
+        for p, view in zip(params, data_views):
+            if view is not None:
+                p.data = view
+        state_views = {}
+        for name in self.buffers:
+            state_views[name] = views(state[name])
+            getattr(self, name).update(zip(params, state_views[name]))
+
+        self._flat = {
+            'params': list(params),
+            'bounds': bounds,
+            'views': data_views,
+            'state_views': state_views,
+            'data': data,
+            'grad': np.empty_like(data),
+            'state': state,
+            # work space for the rules, so a step allocates nothing
+            'scratch': (np.empty_like(data), np.empty_like(data)),
+        }
+        return self._flat
+
+    def rule(self, data, grad, state):
+        raise NotImplementedError
 
 
 # Stochastic Gradient Descent
@@ -15,12 +105,11 @@ class SGD(Optimizer):
         self.lr = lr
         self.decay_rate = decay_rate
 
-    def __call__(self, p: Scalar):
+    def rule(self, data, grad, state):
+        t, _ = self._flat['scratch']
 
-        # θ'   = θ      - (α       * ▽f(θ) )
-        p.data = p.data - (self.lr * p.grad)
-
-        self.lr *= self.decay_rate
+        # θ' = θ - (α       * ▽f(θ))
+        np.subtract(data, np.multiply(self.lr, grad, out=t), out=data)
 
     def __repr__(self):
         return f'SGD(lr={self.lr})'
@@ -29,23 +118,26 @@ class SGD(Optimizer):
 # Stochastic Gradient Descent with Momentum
 class Momentum(Optimizer):
 
+    buffers = ('m', )
+
     def __init__(self, lr=0.01, momentum=0.9, decay_rate=1.0):
         self.lr = lr
         self.momentum = momentum
         self.decay_rate = decay_rate
 
-    def __call__(self, p: Scalar):
+        # moment buffers, keyed by parameter
+        self.m = {}
 
-        if not hasattr(p, 'm'):
-            p.m = 0.0
+    def rule(self, data, grad, state):
+        t, _ = self._flat['scratch']
+        m = state['m']
 
-        # m'= η             * m   + (1 - η            ) * ▽f(θ)
-        p.m = self.momentum * p.m + (1 - self.momentum) * p.grad
+        # m'= η             * m          + (1 - η            ) * ▽f(θ)
+        np.multiply(self.momentum, m, out=m)
+        m += np.multiply(1 - self.momentum, grad, out=t)
 
-        # θ'   = θ      - α       * m'
-        p.data = p.data - self.lr * p.m
-
-        self.lr *= self.decay_rate
+        # θ' = θ - α       * m'
+        data -= np.multiply(self.lr, m, out=t)
 
     def __repr__(self):
         return f'Momentum(lr={self.lr}, Momentum={self.momentum})'
@@ -54,23 +146,27 @@ class Momentum(Optimizer):
 # Stochastic Gradient Descent with Nesterov Accelerated Gradient
 class Nesterov(Optimizer):
 
+    buffers = ('m', )
+
     def __init__(self, lr=0.01, momentum=0.9, decay_rate=1.0):
         self.lr = lr
         self.momentum = momentum
         self.decay_rate = decay_rate
 
-    def __call__(self, p: Scalar):
+        # moment buffers, keyed by parameter
+        self.m = {}
 
-        if not hasattr(p, 'm'):
-            p.m = 0.0
+    def rule(self, data, grad, state):
+        t, u = self._flat['scratch']
+        m = state['m']
 
-        # m'= (η             * m  ) - (α       * ▽f(θ) )
-        p.m = (self.momentum * p.m) - (self.lr * p.grad)
+        # m'= (η             * m         ) - (α       * ▽f(θ))
+        np.multiply(self.momentum, m, out=m)
+        m -= np.multiply(self.lr, grad, out=t)
 
-        # θ'   = θ      + (η             * m' ) - (α       * ▽f(θ) )
-        p.data = p.data + (self.momentum * p.m) - (self.lr * p.grad)
-
-        self.lr *= self.decay_rate
+        # θ' = θ + (η             * m') - (α       * ▽f(θ))
+        data += np.multiply(self.momentum, m, out=u)
+        data -= t
 
     def __repr__(self):
         return f'Nesterov(lr={self.lr}, Momentum={self.momentum})'
@@ -79,23 +175,28 @@ class Nesterov(Optimizer):
 # Adaptive Gradient Algorithm
 class Adagrad(Optimizer):
 
+    buffers = ('v', )
+
     def __init__(self, lr=0.01, epsilon=1e-8, decay_rate=1.0):
         self.lr = lr
         self.epsilon = epsilon
         self.decay_rate = decay_rate
 
-    def __call__(self, p: Scalar):
+        # moment buffers, keyed by parameter
+        self.v = {}
 
-        if not hasattr(p, 'v'):
-            p.v = 0.0
+    def rule(self, data, grad, state):
+        t, u = self._flat['scratch']
+        v = state['v']
 
-        # v'= v   + ▽f(θ)^2
-        p.v = p.v + p.grad ** 2
+        # v'= v          + ▽f(θ)^2
+        v += np.square(grad, out=t)
 
-        # θ'   = θ      - α       * ▽f(θ)  / (        √ v'   + ε           )
-        p.data = p.data - self.lr * p.grad / (math.sqrt(p.v) + self.epsilon)
-
-        self.lr *= self.decay_rate
+        # θ' = θ - α       * ▽f(θ) / (      √ v'  + ε           )
+        np.sqrt(v, out=t)
+        t += self.epsilon
+        np.multiply(self.lr, grad, out=u)
+        data -= np.divide(u, t, out=u)
 
     def __repr__(self):
         return f'Adagrad(lr={self.lr})'
@@ -104,24 +205,31 @@ class Adagrad(Optimizer):
 # Root Mean Square Propogation
 class RMSprop(Optimizer):
 
+    buffers = ('v', )
+
     def __init__(self, lr=0.001, rho=0.9, epsilon=1e-8, decay_rate=1.0):
         self.lr = lr
         self.rho = rho
         self.epsilon = epsilon
         self.decay_rate = decay_rate
 
-    def __call__(self, p: Scalar):
-
-        if not hasattr(p, 'v'):
-            p.v = 0.0
+        # moment buffers, keyed by parameter
+        self.v = {}
 
-        # v'= ρ        * v   + (1 - ρ       ) * ▽f(θ)^2
-        p.v = self.rho * p.v + (1 - self.rho) * p.grad ** 2
+    def rule(self, data, grad, state):
+        t, u = self._flat['scratch']
+        v = state['v']
 
-        # θ'   = θ      - α       * ▽f(θ)  / (        √ v'   + ε)
-        p.data = p.data - self.lr * p.grad / (math.sqrt(p.v) + self.epsilon)
+        # v'= ρ        * v          + (1 - ρ       ) * ▽f(θ)^2
+        np.multiply(self.rho, v, out=v)
+        np.square(grad, out=t)
+        v += np.multiply(1 - self.rho, t, out=t)
 
-        self.lr *= self.decay_rate
+        # θ' = θ - α       * ▽f(θ) / (      √ v'  + ε)
+        np.sqrt(v, out=t)
+        t += self.epsilon
+        np.multiply(self.lr, grad, out=u)
+        data -= np.divide(u, t, out=u)
 
     def __repr__(self):
         return f'RMSprop(lr={self.lr}, rho={self.rho})'
@@ -130,6 +238,8 @@ class RMSprop(Optimizer):
 # Adaptive Moment Estimation
 class Adam(Optimizer):
 
+    buffers = ('m', 'v')
+
     def __init__(self, lr=0.001, beta1=0.9, beta2=0.999, epsilon=1e-8, decay_rate=1.0):
         self.lr = lr
         self.beta1 = beta1
@@ -137,33 +247,39 @@ class Adam(Optimizer):
         self.epsilon = epsilon
         self.decay_rate = decay_rate
 
-    def __call__(self, p):
+        # moment buffers, keyed by parameter
+        self.m = {}
+        self.v = {}
 
-        if not hasattr(p, 'm'):
-            p.m = 0.0
-        if not hasattr(p, 'v'):
-            p.v = 0.0
+    def rule(self, data, grad, state):
 
         # First and Second Moment Estimation
 
-        # m'= β1         * m   + (1 - β1        ) * ▽f(θ)
-        p.m = self.beta1 * p.m + (1 - self.beta1) * p.grad
-        # v'= β1         * v   + (1 - β2        ) * ▽f(θ)^2
-        p.v = self.beta2 * p.v + (1 - self.beta2) * p.grad ** 2
+        t, u = self._flat['scratch']
+        m, v = state['m'], state['v']
+
+        # m'= β1         * m          + (1 - β1        ) * ▽f(θ)
+        np.multiply(self.beta1, m, out=m)
+        m += np.multiply(1 - self.beta1, grad, out=t)
+        # v'= β1         * v          + (1 - β2        ) * ▽f(θ)^2
+        np.multiply(self.beta2, v, out=v)
+        np.square(grad, out=t)
+        v += np.multiply(1 - self.beta2, t, out=t)
 
         # Bias Correction
 
-        # m^  = m'  / (1 - β1)
-        m_hat = p.m / (1 - self.beta1)
-        # v^  = v'  / (1 - β2)
-        v_hat = p.v / (1 - self.beta2)
+        # m^  = m' / (1 - β1)
+        np.divide(m, 1 - self.beta1, out=u)
+        # v^  = v' / (1 - β2)
+        np.divide(v, 1 - self.beta2, out=t)
 
         # Parameter Update
 
-        # θ'   = θ      - α       * m^    / (        √ v^   ) + ε           )
-        p.data = p.data - self.lr * m_hat / (math.sqrt(v_hat) + self.epsilon)
-
-        self.lr *= self.decay_rate
+        # θ' = θ - α       * m^    / (        √ v^  ) + ε           )
+        np.sqrt(t, out=t)
+        t += self.epsilon
+        u *= self.lr
+        data -= np.divide(u, t, out=u)
 
     def __repr__(self):
         return f'Adam(lr={self.lr}, β1={self.beta1}, β2={self.beta2})'
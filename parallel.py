@@ -0,0 +1,220 @@
+import traceback
+
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from kaitorch.core import Scalar, no_grad
+from kaitorch.layers import Dropout
+
+__all__ = ['DataParallel', 'score']
+
+
+class DataParallel:
+    '''
+    A pool of forked worker processes, each holding a replica of a built
+    and compiled Sequential, that computes one batch's gradient in shards.
+
+    Weights and gradients travel through shared memory as flat float64
+    arrays - one weight buffer every replica reads, and one gradient row
+    per worker - so the only thing sent over the pipes is each shard's
+    records, as a slice or their indices, and its loss. The training data is inherited by the
+    fork and never copied. Linux only, since replicas are forked.
+    '''
+
+    def __init__(self, model, x, y, workers):
+        if workers < 2:
+            raise Exception('[Invalid Workers] - DataParallel needs at least 2 workers')
+        if 'fork' not in mp.get_all_start_methods():
+            raise Exception('[Unsupported Platform] - DataParallel needs the fork start method')
+
+        self.model = model
+        self.x, self.y = x, y
+        self.workers = workers
+
+        self.params = model.parameters()
+        self.shapes = [np.shape(p.data) for p in self.params]
+        self.bounds = np.cumsum([0] + [int(np.prod(shape)) for shape in self.shapes])
+        size = int(self.bounds[-1])
+
+        self._weights_shm = SharedMemory(create=True, size=max(size, 1) * 8)
+        self._grads_shm = SharedMemory(create=True, size=max(size, 1) * 8 * workers)
+        self.weights = np.ndarray((size, ), dtype=np.float64, buffer=self._weights_shm.buf)
+        self.grads = np.ndarray((workers, size), dtype=np.float64, buffer=self._grads_shm.buf)
+
+        # each worker draws its own Dropout masks, from generators seeded
+        # by the layers' own - a new pool takes new seeds
+        dropouts = [layer for layer in model.layers if isinstance(layer, Dropout)]
+        self.dropout_seeds = [[int(layer.rng.integers(2 ** 63)) for layer in dropouts] for _ in range(workers)]
+
+        ctx = mp.get_context('fork')
+        self.pipes, self.processes = [], []
+        for rank in range(workers):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(target=self._serve, args=(rank, child), daemon=True)
+            process.start()
+            child.close()
+            self.pipes.append(parent)
+            self.processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __call__(self, batch):
+        '''
+        Publish the current weights, run forward and backward for each
+        shard of the batch in its own worker, and leave the batch gradient
+        - the shard gradients summed - on the model's parameters.
+        Returns the batch loss.
+        '''
+        shards, size = split(batch, len(self.x), self.workers)
+
+        for p, lo, hi in zip(self.params, self.bounds, self.bounds[1:]):
+            self.weights[lo:hi] = np.ravel(p.data)
+
+        for pipe, shard in zip(self.pipes, shards):
+            pipe.send((shard, size))
+
+        loss = 0.0
+        for pipe in self.pipes[:len(shards)]:
+            status, value = pipe.recv()
+            if status == 'error':
+                raise Exception(f'[Worker Failed] - {value}')
+            loss += value
+
+        grad = self.grads[:len(shards)].sum(axis=0)
+        for p, shape, lo, hi in zip(self.params, self.shapes, self.bounds, self.bounds[1:]):
+            p.grad = float(grad[lo]) if isinstance(p, Scalar) else grad[lo:hi].reshape(shape)
+
+        return loss
+
+    def _serve(self, rank, pipe):
+        model = self.model
+
+        # forked replicas start from the parent's generators
+        dropouts = [layer for layer in model.layers if isinstance(layer, Dropout)]
+        for layer, seed in zip(dropouts, self.dropout_seeds[rank]):
+            layer.rng = np.random.default_rng(seed)
+
+        tape = model.tape if not dropouts else None
+
+        while True:
+            message = pipe.recv()
+            if message is None:
+                break
+            shard, batch_size = message
+            try:
+                for p, shape, lo, hi in zip(self.params, self.shapes, self.bounds, self.bounds[1:]):
+                    p.data = float(self.weights[lo]) if isinstance(p, Scalar) else self.weights[lo:hi].reshape(shape)
+
+                model.zero_grad()
+                x_shard = self.x[shard]
+                if tape is not None:
+                    y_pred = tape(x_shard)
+                else:
+                    y_pred = model(x_shard, train=True)
+                loss = model.loss(self.y[shard], y_pred)
+                if tape is not None:
+                    tape.backward(loss)
+                else:
+                    loss.backward()
+
+                # losses are means over records, so each shard counts by its share
+                share = len(x_shard) / batch_size
+                for p, lo, hi in zip(self.params, self.bounds, self.bounds[1:]):
+                    self.grads[rank, lo:hi] = np.ravel(p.grad) * share
+
+                pipe.send(('ok', float(np.sum(loss.data)) * share))
+            except Exception:
+                pipe.send(('error', traceback.format_exc()))
+        pipe.close()
+
+    def close(self):
+        for pipe in self.pipes:
+            try:
+                pipe.send(None)
+                pipe.close()
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join()
+        self.pipes, self.processes = [], []
+
+        if self._weights_shm is not None:
+            del self.weights, self.grads
+            for shm in (self._weights_shm, self._grads_shm):
+                shm.close()
+                shm.unlink()
+            self._weights_shm = self._grads_shm = None
+
+
+def split(batch, records, parts):
+    '''
+    Split a batch - a slice of the records or an array of their indices -
+    into up to parts shards, sized as np.array_split would. A slice's
+    shards are slices, so its indices are never materialized. Returns the
+    shards and the batch size.
+    '''
+    # a range stands in for a slice's indices, and slicing it is O(1)
+    indices = range(records)[batch] if isinstance(batch, slice) else batch
+    size = len(indices)
+    q, r = divmod(size, parts)
+    edges = [i * q + min(i, r) for i in range(parts + 1)]
+
+    shards = []
+    for lo, hi in zip(edges, edges[1:]):
+        if hi > lo:
+            shard = indices[lo:hi]
+            shards.append(slice(shard.start, shard.stop, shard.step) if isinstance(shard, range) else shard)
+    return shards, size
+
+
+# state each scoring worker inherits through the fork
+_scoring = {}
+
+
+def _score_init(model, x, batch_size):
+    _scoring.update(model=model, x=x, batch_size=batch_size)
+
+
+def _score_chunk(bounds):
+    model, x, batch_size = _scoring['model'], _scoring['x'], _scoring['batch_size']
+    lo, hi = bounds
+    batch_size = batch_size or hi - lo
+
+    # the same batches, through the same forward, as Sequential.run
+    y_pred = []
+    with no_grad():
+        for i in range(lo, hi, batch_size):
+            x_batch = x[i:min(i + batch_size, hi)]
+            if model.tape is not None:
+                batch_pred = model.tape(x_batch)
+            else:
+                batch_pred = model(x_batch, train=False)
+            y_pred.append(batch_pred.data.copy())
+    return np.concatenate(y_pred)
+
+
+def score(model, x, workers, chunk_size, batch_size=None):
+    '''
+    Forward contiguous chunks of x through a pool of forked replicas of
+    model, yielding each chunk's outputs in input order.
+
+    Model weights and x reach the workers through the fork, once; only
+    chunk bounds and outputs are pickled. Every chunk is split into
+    batches of batch_size (the whole chunk when None), so the outputs are
+    bit for bit those of Sequential.run over the same batches - a
+    chunk_size that is not a whole number of batches is rounded up to one.
+    '''
+    if batch_size:
+        chunk_size = -(-chunk_size // batch_size) * batch_size
+
+    chunks = [(i, min(i + chunk_size, len(x))) for i in range(0, len(x), chunk_size)]
+
+    ctx = mp.get_context('fork')
+    with ctx.Pool(workers, initializer=_score_init, initargs=(model, x, batch_size)) as pool:
+        yield from pool.imap(_score_chunk, chunks)
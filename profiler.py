@@ -0,0 +1,135 @@
+import json
+import os
+import time
+
+from kaitorch.core import Tensor, build_topo, op_label
+from kaitorch.layers import Dropout
+
+__all__ = ['Profiler']
+
+
+class Profiler:
+    '''
+    Wall time and call counts of a Sequential's training and inference,
+    broken down into forward per layer, backward per op, loss and step.
+
+    Sequential.run only swaps its forward, loss, backward and step for the
+    timed versions from wrap() while a profiler is attached; otherwise the
+    profiler costs one attribute check per run.
+    '''
+
+    def __init__(self, max_events=100_000):
+        # (phase, name) -> [calls, seconds]
+        self.stats = {}
+        # complete events for the Chrome trace, capped to bound memory
+        self.events = []
+        self.max_events = max_events
+        self.start = time.perf_counter()
+
+    def __repr__(self):
+        return f'Profiler(entries={len(self.stats)}, events={len(self.events)})'
+
+    def record(self, phase, name, start, end):
+        entry = self.stats.get((phase, name))
+        if entry is None:
+            entry = self.stats[(phase, name)] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += end - start
+
+        if len(self.events) < self.max_events:
+            self.events.append({
+                'name': name,
+                'cat': phase,
+                'ph': 'X',
+                'ts': (start - self.start) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': os.getpid(),
+                'tid': 0,
+            })
+
+    def reset(self):
+        self.stats.clear()
+        self.events.clear()
+        self.start = time.perf_counter()
+
+    def wrap(self, model, tape, train):
+        '''
+        Timed stand-ins for the forward, loss, backward and step of one run.
+        '''
+        clock = time.perf_counter
+
+        def replayed(replay, nodes, i):
+            # the tape's hook: each layer's slice timed under the layer
+            t = clock()
+            replay(nodes)
+            self.record('forward', f'{i} {tape.layers[i][0]!r}', t, clock())
+
+        def forward(x):
+            start = clock()
+            if tape is not None:
+                x = tape(x, hook=replayed)
+            else:
+                x = x if isinstance(x, Tensor) else Tensor(x)
+                for i, layer in enumerate(model.layers):
+                    t = clock()
+                    x = layer(x, train) if isinstance(layer, Dropout) else layer(x)
+                    self.record('forward', f'{i} {layer!r}', t, clock())
+            self.record('forward', 'total', start, clock())
+            return x
+
+        def loss(y, y_pred):
+            start = clock()
+            out = model.loss(y, y_pred)
+            self.record('loss', repr(model.loss), start, clock())
+            return out
+
+        def timed(rule, node):
+            # backprop's hook: each rule timed under its op's label
+            t = clock()
+            rule(node)
+            self.record('backward', op_label(node), t, clock())
+
+        def backward(out):
+            start = clock()
+            if tape is not None:
+                tape.backward(out, hook=timed)
+            else:
+                t = clock()
+                topo = build_topo(out)
+                self.record('backward', 'build_topo', t, clock())
+                out.backward(topo, hook=timed)
+            self.record('backward', 'total', start, clock())
+
+        def step():
+            start = clock()
+            model.step()
+            self.record('step', repr(model.optimizer), start, clock())
+
+        return forward, loss, backward, step
+
+    def summary(self):
+        '''
+        Print the time spent per phase and entry, slowest first.
+        '''
+        total = sum(seconds for (phase, name), (calls, seconds) in self.stats.items() if name == 'total' or phase in ('loss', 'step'))
+
+        print("_" * 115)
+        print(f"{'Phase':<12}{'Name':<61}{'Calls':>10}{'Total (ms)':>12}{'Mean (µs)':>12}{'%':>8}")
+        print("=" * 115)
+        for phase in ('forward', 'loss', 'backward', 'step'):
+            entries = [(name, calls, seconds) for (p, name), (calls, seconds) in self.stats.items() if p == phase]
+            entries.sort(key=lambda entry: (entry[0] != 'total', -entry[2]))
+            for name, calls, seconds in entries:
+                share = 100 * seconds / total if total else 0.0
+                print(f"{phase:<12}{name[:60]:<61}{calls:>10}{seconds * 1e3:>12.2f}{seconds / calls * 1e6:>12.1f}{share:>8.1f}")
+            if entries:
+                print("_" * 115)
+        print(f"Total Profiled: {total * 1e3:.2f} ms")
+        print("_" * 115)
+
+    def export_chrome_trace(self, path):
+        '''
+        Write the recorded events as a Chrome trace (chrome://tracing, Perfetto).
+        '''
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,129 @@
+'''
+A forward-only executor for saved Sequential models, on plain NumPy
+arrays. Imports nothing from the training stack - no autodiff graph, no
+tqdm, no graphviz - so a scoring process starts in the time it takes to
+import numpy and map the checkpoint.
+
+    from kaitorch.runtime import Runtime
+    model = Runtime.load('model.kt')
+    y = model.predict(x)
+'''
+import numpy as np
+
+from kaitorch.checkpoint import read
+
+__all__ = ['Runtime']
+
+
+# The activations, on arrays, computed exactly as kaitorch.functional does
+# in training, so outputs match Sequential.predict bit for bit.
+
+def sigmoid(x):
+    z = np.exp(-np.abs(x))
+    return np.where(x < 0, z / (1 + z), 1 / (1 + z))
+
+
+def tanh(x):
+    return np.tanh(x)
+
+
+def ReLU(x):
+    return np.where(x < 0, 0.0, x)
+
+
+def LeakyReLU(x, alpha=0.01):
+    return np.where(x < 0, x * alpha, x)
+
+
+def ELU(x, alpha=0.01):
+    return np.where(x < 0, alpha * np.expm1(np.minimum(x, 0)), x)
+
+
+def swish(x, beta=1):
+    return x * sigmoid(x * beta)
+
+
+def softmax(x):
+    # as the Tensor graph computes it: exps * (sums + 1e-8) ** -1, with
+    # pow adding its own 1e-8
+    exps = np.exp(x)
+    sums = exps.sum(axis=-1, keepdims=True)
+    return exps * ((sums + 1e-8 + 1e-8) ** -1)
+
+
+ACTIVATIONS = {
+    'sigmoid': sigmoid,
+    'tanh': tanh,
+    'ReLU': ReLU,
+    'LeakyReLU': LeakyReLU,
+    'ELU': ELU,
+    'swish': swish,
+    'softmax': softmax,
+}
+
+
+class Runtime:
+    '''
+    The Dense layers of a saved model as (w, b, activation) triples.
+    Dropout only acts in training, so it is left out.
+    '''
+
+    def __init__(self, layers, input_size):
+        self.layers = layers
+        self.input_size = input_size
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        '''
+        Read a checkpoint written by Sequential.save. Weights stay
+        read-only views into a memory map of the file by default, shared
+        between processes that load the same file.
+        '''
+        header, arrays = read(path, mmap_mode)
+
+        layers = []
+        for i, spec in enumerate(header['layers']):
+            if spec['type'] == 'Dropout':
+                continue
+            if spec['type'] != 'Dense':
+                raise Exception(f'[Unsupported Layer] - The runtime cannot run {spec["type"]} layers')
+
+            activation = spec['activation']
+            if activation is None:
+                fn = None
+            elif isinstance(activation, dict):
+                fn = ACTIVATIONS[activation['name']]
+                params = activation['params']
+                fn = (lambda fn, params: lambda x: fn(x, **params))(fn, params)
+            else:
+                fn = ACTIVATIONS[activation]
+
+            layers.append((arrays[f'{i}.0'], arrays[f'{i}.1'], fn))
+
+        return cls(layers, header['input_size'])
+
+    def __call__(self, x):
+        for w, b, activation in self.layers:
+            x = x @ w + b
+            if activation is not None:
+                x = activation(x)
+        return x
+
+    def predict(self, x, batch_size=None):
+        '''
+        Outputs for the records in x, as one (records, outputs) array.
+        With batch_size, records go through in batches of that size.
+        '''
+        x = np.asarray(x, dtype=np.float64)
+        if x.ndim == 1:
+            x = x.reshape(-1, 1)
+        if x.shape[1] != self.input_size:
+            raise Exception(f'[Shape Mismatch] - Model takes {self.input_size} features, got {x.shape[1]}')
+
+        if batch_size is None:
+            return self(x)
+        return np.concatenate([self(x[i:i + batch_size]) for i in range(0, len(x), batch_size)])
+
+    def __repr__(self):
+        sizes = [self.input_size] + [b.shape[0] for _, b, _ in self.layers]
+        return f'Runtime(layers={sizes})'
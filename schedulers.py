@@ -0,0 +1,171 @@
+import math
+
+__all__ = ['StepDecay', 'ExponentialDecay', 'CosineDecay', 'Warmup', 'ReduceOnPlateau']
+
+INTERVALS = ('step', 'epoch')
+
+
+class Scheduler:
+    '''
+    Sets an optimizer's learning rate from a schedule, advanced once per
+    optimizer step or once per epoch - interval 'step' or 'epoch'. The
+    schedule starts from the learning rate the optimizer has when first
+    attached, and takes the rate over from then on - so the optimizer's
+    own decay_rate must be left at 1.
+    '''
+
+    def __init__(self, interval):
+        if interval not in INTERVALS:
+            raise Exception(f'[Invalid Interval] - interval must be one of {INTERVALS}, not "{interval}"')
+
+        self.interval = interval
+        self.base_lr = None
+        self.count = 0
+        self.optimizer = None
+
+    def attach(self, optimizer):
+        # the optimizer would multiply in its decay between scheduled rates
+        if getattr(optimizer, 'decay_rate', 1.0) != 1:
+            raise Exception(
+                f'[Conflicting Decay] - {type(optimizer).__name__} has decay_rate={optimizer.decay_rate}; '
+                'leave it at 1 and let the scheduler set the rate'
+            )
+        # attaching again - another fit, a loaded model - picks up where the schedule was
+        if self.base_lr is None:
+            self.base_lr = optimizer.lr
+        self.optimizer = optimizer
+        optimizer.lr = self.get_lr(self.count)
+        return self
+
+    def step(self, loss=None):
+        if self.optimizer is None:
+            raise Exception('[Scheduler Not Attached] - Use attach(optimizer) or pass the scheduler to fit')
+        self.count += 1
+        self.optimizer.lr = self.get_lr(self.count)
+
+    def get_lr(self, count):
+        raise NotImplementedError
+
+
+class StepDecay(Scheduler):
+
+    def __init__(self, step_size, gamma=0.1, interval='epoch'):
+        super().__init__(interval)
+        self.step_size = step_size
+        self.gamma = gamma
+
+    def get_lr(self, count):
+
+        # α' = α₀ * γ ^ ⌊t / s⌋
+        return self.base_lr * self.gamma ** (count // self.step_size)
+
+    def __repr__(self):
+        return f'StepDecay(step_size={self.step_size}, γ={self.gamma}, interval={self.interval})'
+
+
+class ExponentialDecay(Scheduler):
+
+    def __init__(self, gamma=0.99, interval='step'):
+        super().__init__(interval)
+        self.gamma = gamma
+
+    def get_lr(self, count):
+
+        # α' = α₀ * γ ^ t
+        return self.base_lr * self.gamma ** count
+
+    def __repr__(self):
+        return f'ExponentialDecay(γ={self.gamma}, interval={self.interval})'
+
+
+class CosineDecay(Scheduler):
+
+    def __init__(self, period, min_lr=0.0, interval='step'):
+        super().__init__(interval)
+        self.period = period
+        self.min_lr = min_lr
+
+    def get_lr(self, count):
+
+        # α' = α_min + (α₀ - α_min) * (1 + cos(π * t / T)) / 2, held at α_min after T
+        t = min(count, self.period)
+        return self.min_lr + (self.base_lr - self.min_lr) * (1 + math.cos(math.pi * t / self.period)) / 2
+
+    def __repr__(self):
+        return f'CosineDecay(period={self.period}, min_lr={self.min_lr}, interval={self.interval})'
+
+
+class Warmup(Scheduler):
+    '''
+    Ramps the learning rate linearly up to its starting value over the
+    first steps, then follows after - another schedule, counted from the
+    end of the warmup - or holds it.
+    '''
+
+    def __init__(self, steps, after=None, interval='step'):
+        super().__init__(interval)
+        if isinstance(after, ReduceOnPlateau):
+            raise Exception('[Invalid Schedule] - ReduceOnPlateau follows the loss, so cannot follow a warmup')
+        self.steps = steps
+        self.after = after
+
+    def attach(self, optimizer):
+        # after starts from the same rate, and attach already reads it when
+        # there are no warmup steps
+        if self.after is not None:
+            self.after.base_lr = self.base_lr if self.base_lr is not None else optimizer.lr
+        return super().attach(optimizer)
+
+    def get_lr(self, count):
+
+        # α' = α₀ * (t + 1) / n while t < n
+        if count < self.steps:
+            return self.base_lr * (count + 1) / self.steps
+        if self.after is None:
+            return self.base_lr
+        return self.after.get_lr(count - self.steps)
+
+    def __repr__(self):
+        return f'Warmup(steps={self.steps}, after={self.after}, interval={self.interval})'
+
+
+class ReduceOnPlateau(Scheduler):
+    '''
+    Multiplies the learning rate by factor once the epoch loss has gone
+    patience epochs without improving on its best by more than min_delta.
+    '''
+
+    def __init__(self, factor=0.1, patience=10, min_delta=1e-4, min_lr=0.0):
+        super().__init__('epoch')
+        self.factor = factor
+        self.patience = patience
+        self.min_delta = min_delta
+        self.min_lr = min_lr
+
+        # the loss to beat, epochs since it was last beaten, and the current rate
+        self.best = math.inf
+        self.wait = 0
+        self.lr = None
+
+    def step(self, loss=None):
+        if loss is None:
+            raise Exception('[Missing Loss] - ReduceOnPlateau needs the epoch loss')
+        super().step(loss)
+
+        if loss < self.best - self.min_delta:
+            self.best = loss
+            self.wait = 0
+        else:
+            self.wait += 1
+            if self.wait > self.patience:
+                self.lr = max(self.lr * self.factor, self.min_lr)
+                self.wait = 0
+        self.optimizer.lr = self.lr
+
+    def get_lr(self, count):
+        if self.lr is None:
+            self.lr = self.base_lr
+        return self.lr
+
+    def __repr__(self):
+        return f'ReduceOnPlateau(factor={self.factor}, patience={self.patience})'
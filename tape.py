@@ -0,0 +1,71 @@
+import numpy as np
+
+from kaitorch.core import Tensor, backprop, build_topo, replay
+from kaitorch.layers import Dropout
+
+__all__ = ['Tape']
+
+
+class Tape:
+    '''
+    One forward pass of a built Sequential, recorded once as a flat list of
+    graph nodes in topological order. Calling the tape writes a new batch
+    into its input node and recomputes every node in place, so repeated
+    forward/backward passes allocate no model graph nodes. The recorded ops
+    do not depend on the batch size, so any number of records can be replayed.
+
+    Only graphs whose structure does not depend on the input can be
+    replayed - Dropout in training mode is the exception, so the model
+    records with train=False.
+    '''
+
+    def __init__(self, model):
+        self.input = Tensor(np.zeros((1, model.layer_sizes[0])))
+
+        # recorded layer by layer, so each layer's ops sit together in topo
+        # and layers[i] = (layer, start, end) bounds them
+        self.topo, self.nodes, self.layers = [], set(), []
+        x = self.input
+        for layer in model.layers:
+            x = layer(x, False) if isinstance(layer, Dropout) else layer(x)
+            ops = [node for node in build_topo(x, stop=self.nodes) if node._op and node not in self.nodes]
+            self.layers.append((layer, len(self.topo), len(self.topo) + len(ops)))
+            self.topo += ops
+            self.nodes.update(ops)
+        self.output = x
+
+    def __len__(self):
+        return len(self.topo)
+
+    def __call__(self, x, hook=None):
+        '''
+        Replay the tape on the batch x. A hook, if given, is called as
+        hook(replay, nodes, i) in place of replay(nodes) for the i-th
+        layer's slice of the tape, and must run it - the profiler times
+        the layers this way.
+        '''
+        self.input.data = np.asarray(x, dtype=np.float64)
+        if hook is None:
+            replay(self.topo)
+        else:
+            for i, (layer, lo, hi) in enumerate(self.layers):
+                hook(replay, self.topo[lo:hi], i)
+        return self.output
+
+    def backward(self, loss, grad=1.0, hook=None):
+        '''
+        Backpropagate loss, built on this tape's output, into the
+        parameters. Parameter gradients accumulate across calls. hook is
+        passed on to backprop.
+        '''
+        # the input's gradient is unused, but must follow the batch shape
+        self.input.grad = 0.0
+        for node in self.topo:
+            node.grad = 0.0
+
+        # the loss graph is rebuilt per batch, so it stops at the tape and
+        # is released as it goes; the tape itself is kept for the next batch
+        loss_topo = build_topo(loss, stop=self.nodes)
+        loss.grad = np.full_like(loss.data, grad)
+        backprop(loss_topo, release=True, hook=hook)
+        backprop(self.topo, hook=hook)
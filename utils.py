@@ -1,4 +1,6 @@
-__all__ = ['wrap', 'unwrap', 'ffill', 'as_onehot']
+import numpy as np
+
+__all__ = ['wrap', 'unwrap', 'ffill', 'as_onehot', 'as_batch', 'count_params', 'RunningMean']
 
 
 def wrap(x):
@@ -28,3 +30,33 @@ def ffill(x: list):
 def as_onehot(y_pred: list):
     max_pred = max(y_pred)
     return [1 if x == max_pred else 0 for x in y_pred]
+
+
+def as_batch(x):
+    # records as rows of a float array; a flat list is one feature per record
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim == 1:
+        x = x.reshape(-1, 1)
+    return x
+
+
+def count_params(params: list):
+    return sum(np.size(p.data) for p in params)
+
+
+class RunningMean:
+    '''
+    Weighted mean of a stream of values, updated in O(1) per value.
+    '''
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+
+    def update(self, value, weight=1):
+        self.count += weight
+        self.mean += (float(value) - self.mean) * weight / self.count
+        return self.mean
+
+    def __repr__(self):
+        return f'RunningMean(mean={self.mean:.4f}, count={self.count})'